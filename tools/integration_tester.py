@@ -5,7 +5,6 @@ Category: testing_qa
 OpenAI Compatible: Yes
 """
 
-import json
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -25,80 +24,38 @@ class IntegrationTesterTool:
         self.initialized_at = datetime.now()
         logger.info(f"IntegrationTesterTool initialized")
 
-    def initialize(self, **kwargs):
-        """Execute initialize operation"""
-        try:
-            return {"success": True, "function": "initialize"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
 
-    def execute(self, **kwargs):
-        """Execute execute operation"""
-        try:
-            return {"success": True, "function": "execute"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+# Operations exposed by the tool; the methods and OpenAI schemas are generated from this
+METHODS = ("initialize", "execute", "query", "update")
 
-    def query(self, **kwargs):
-        """Execute query operation"""
-        try:
-            return {"success": True, "function": "query"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
 
-    def update(self, **kwargs):
-        """Execute update operation"""
-        try:
-            return {"success": True, "function": "update"}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+def _make_operation(name: str):
+    """Build a stub operation method that reports its own name."""
+    def operation(self, **kwargs):
+        return {"success": True, "function": name}
+    operation.__name__ = name
+    operation.__qualname__ = f"IntegrationTesterTool.{name}"
+    operation.__doc__ = f"Execute {name} operation"
+    return operation
+
+
+for _name in METHODS:
+    setattr(IntegrationTesterTool, _name, _make_operation(_name))
 
 
 OPENAI_FUNCTIONS = [
     {
         "type": "function",
         "function": {
-            "name": "initialize",
-            "description": "Initialize for integration tester",
-            "parameters": {
-                "type": "object",
-                "properties": {}
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "execute",
-            "description": "Execute for integration tester",
-            "parameters": {
-                "type": "object",
-                "properties": {}
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "query",
-            "description": "Query for integration tester",
-            "parameters": {
-                "type": "object",
-                "properties": {}
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "update",
-            "description": "Update for integration tester",
+            "name": name,
+            "description": f"{name.capitalize()} for integration tester",
             "parameters": {
                 "type": "object",
                 "properties": {}
             }
         }
     }
+    for name in METHODS
 ]
 
 
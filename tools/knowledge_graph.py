@@ -9,14 +9,214 @@ OpenAI Compatible: Yes
 """
 
 import json
+import os
 import sqlite3
+import threading
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Set, Tuple
+from queue import Empty, Queue
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    njit = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of entity name -> id mappings kept in memory
+ENTITY_ID_CACHE_SIZE = 10000
+
+# Names resolved per IN (...) query, kept below SQLite's bound-parameter limit
+NAME_LOOKUP_BATCH_SIZE = 500
+
+# Result keys for the column lists selected in query_entity
+ENTITY_COLUMNS = ('id', 'name', 'entity_type', 'properties', 'created_at', 'updated_at')
+RELATIONSHIP_COLUMNS = ('id', 'source_id', 'target_id', 'relationship_type', 'properties',
+                        'strength', 'created_at')
+OUTGOING_COLUMNS = RELATIONSHIP_COLUMNS + ('target_name', 'target_type')
+INCOMING_COLUMNS = RELATIONSHIP_COLUMNS + ('source_name', 'source_type')
+
+# SQL statements are module-level constants so every call passes the same string
+# and sqlite3's per-connection statement cache reuses the prepared statement.
+SQL_GET_ID = 'SELECT id FROM entities WHERE name = ?'
+
+SQL_INSERT_ENTITY = '''
+    INSERT OR REPLACE INTO entities (name, entity_type, properties, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+# Relationships are clustered on (source_id, target_id, id) in a WITHOUT ROWID
+# table, so ids are allocated from the current maximum at insert time.
+SQL_INSERT_RELATIONSHIP = '''
+    INSERT INTO relationships (source_id, target_id, id, relationship_type, strength, properties, created_at)
+    VALUES (?, ?, (SELECT IFNULL(MAX(id), 0) + 1 FROM relationships), ?, ?, ?, ?)
+'''
+
+SQL_SELECT_ENTITY = '''
+    SELECT id, name, entity_type, properties, created_at, updated_at
+    FROM entities WHERE name = ?
+'''
+
+SQL_OUTGOING = '''
+    SELECT r.id, r.source_id, r.target_id, r.relationship_type, r.properties,
+           r.strength, r.created_at, e.name, e.entity_type
+    FROM relationships r
+    JOIN entities e ON r.target_id = e.id
+    WHERE r.source_id = ?
+'''
+
+SQL_INCOMING = '''
+    SELECT r.id, r.source_id, r.target_id, r.relationship_type, r.properties,
+           r.strength, r.created_at, e.name, e.entity_type
+    FROM relationships r
+    JOIN entities e ON r.source_id = e.id
+    WHERE r.target_id = ?
+'''
+
+SQL_ENTITY_PROPERTY = 'SELECT json_extract(properties, ?) AS value FROM entities WHERE name = ?'
+
+SQL_FIND_BY_PROPERTY = '''
+    SELECT name, entity_type, properties FROM entities
+    WHERE json_extract(properties, ?) = ?
+'''
+
+SQL_ADJACENCY = 'SELECT source_id, target_id FROM relationships'
+
+# Each UNION half is an index range scan on one side of the relationship.
+SQL_NEIGHBORS = '''
+    SELECT e.name, e.entity_type, r.relationship_type
+    FROM relationships r
+    JOIN entities e ON e.id = r.target_id
+    WHERE r.source_id = ? AND r.target_id != ?
+    UNION
+    SELECT e.name, e.entity_type, r.relationship_type
+    FROM relationships r
+    JOIN entities e ON e.id = r.source_id
+    WHERE r.target_id = ? AND r.source_id != ?
+'''
+
+SQL_NEIGHBORS_BY_TYPE = '''
+    SELECT e.name, e.entity_type, r.relationship_type
+    FROM relationships r
+    JOIN entities e ON e.id = r.target_id
+    WHERE r.source_id = ? AND r.target_id != ? AND r.relationship_type = ?
+    UNION
+    SELECT e.name, e.entity_type, r.relationship_type
+    FROM relationships r
+    JOIN entities e ON e.id = r.source_id
+    WHERE r.target_id = ? AND r.source_id != ? AND r.relationship_type = ?
+'''
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize properties to JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _loads(data: str) -> Any:
+    """Parse JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _csr_shortest_path(indptr, indices, parent, frontier, source_id, target_id, max_hops):
+    """
+    Breadth-first search over a CSR adjacency (``indptr``/``indices``).
+    
+    ``parent`` must be filled with -1 and ``frontier`` sized to the node count.
+    Returns the number of hops to ``target_id`` (with ``parent`` recording the
+    tree) or -1 when it is not reachable within ``max_hops``.
+    """
+    parent[source_id] = source_id
+    frontier[0] = source_id
+    head = 0
+    tail = 1
+    hops = 0
+    while head < tail and hops < max_hops:
+        level_end = tail
+        while head < level_end:
+            node_id = frontier[head]
+            head += 1
+            for k in range(indptr[node_id], indptr[node_id + 1]):
+                neighbor_id = indices[k]
+                if parent[neighbor_id] == -1:
+                    parent[neighbor_id] = node_id
+                    if neighbor_id == target_id:
+                        return hops + 1
+                    frontier[tail] = neighbor_id
+                    tail += 1
+        hops += 1
+    return -1
+
+
+# Compiled to native code when numba is installed
+_csr_shortest_path_jit = njit(cache=True)(_csr_shortest_path) if njit is not None else None
+
+
+class SQLiteConnectionPool:
+    """
+    Thread-safe pool of long-lived SQLite connections.
+    
+    Connections are opened lazily up to ``size`` and handed out through a
+    queue, so concurrent callers do not serialize on a single connection and
+    each connection keeps its page cache warm between queries.
+    """
+    
+    def __init__(self, db_path: str, size: int = 4):
+        self.db_path = db_path
+        self.size = size
+        self._idle = Queue()
+        self._opened = 0
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, cached_statements=512,
+                               isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, returning it to the pool when done."""
+        try:
+            conn = self._idle.get_nowait()
+        except Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            conn = self._connect() if can_open else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+    
+    def close(self):
+        """Close every idle connection in the pool."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
 
 class KnowledgeGraphTool:
     """
@@ -30,59 +230,177 @@ class KnowledgeGraphTool:
     - Knowledge inference
     """
     
-    def __init__(self, db_path: str = "./knowledge_graph.db"):
+    def __init__(self, db_path: str = "./knowledge_graph.db", pool_size: int = 4,
+                 indexed_properties: Optional[List[str]] = None,
+                 in_memory: bool = False, snapshot_interval: float = 30.0):
         self.db_path = db_path
-        self.conn = None
+        self.indexed_properties = set(indexed_properties or [])
+        for key in self.indexed_properties:
+            if not key.isidentifier():
+                raise ValueError(f"Indexed property name must be an identifier: {key!r}")
+        
+        # In-memory graphs live on a single ':memory:' connection and are
+        # periodically copied to db_path by a background thread.
+        self.in_memory = in_memory
+        self.snapshot_interval = snapshot_interval
+        if in_memory:
+            self._pool = SQLiteConnectionPool(':memory:', size=1)
+        else:
+            self._pool = SQLiteConnectionPool(db_path, size=pool_size)
+        self._lock = threading.Lock()
+        self._adjacency = None
+        self._csr = None
+        # Bumped on every relationship write, so an adjacency list loaded
+        # concurrently with a write is not cached
+        self._graph_version = 0
+        self._entity_ids = OrderedDict()
+        self._snapshot_stop = threading.Event()
+        self._snapshot_thread = None
+        
+        if in_memory:
+            self._load_snapshot()
         self._initialize_database()
-        logger.info(f"KnowledgeGraph initialized: db={db_path}")
+        if in_memory:
+            self._snapshot_thread = threading.Thread(target=self._snapshot_loop, daemon=True)
+            self._snapshot_thread.start()
+        logger.info(f"KnowledgeGraph initialized: db={db_path}, in_memory={in_memory}")
     
     def _initialize_database(self):
         """Initialize database with entities and relationships."""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
-        cursor = self.conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS entities (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                entity_type TEXT NOT NULL,
-                properties TEXT,
-                created_at TEXT NOT NULL,
-                updated_at TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS relationships (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source_id INTEGER NOT NULL,
-                target_id INTEGER NOT NULL,
-                relationship_type TEXT NOT NULL,
-                properties TEXT,
-                strength REAL DEFAULT 1.0,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (source_id) REFERENCES entities(id),
-                FOREIGN KEY (target_id) REFERENCES entities(id)
-            )
-        ''')
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS entities (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT UNIQUE NOT NULL,
+                    entity_type TEXT NOT NULL,
+                    properties TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS relationships (
+                    source_id INTEGER NOT NULL,
+                    target_id INTEGER NOT NULL,
+                    id INTEGER NOT NULL,
+                    relationship_type TEXT NOT NULL,
+                    properties TEXT,
+                    strength REAL DEFAULT 1.0,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (source_id, target_id, id),
+                    FOREIGN KEY (source_id) REFERENCES entities(id),
+                    FOREIGN KEY (target_id) REFERENCES entities(id)
+                ) WITHOUT ROWID
+            ''')
+            
+            # Outgoing edges are clustered by the primary key; these serve
+            # reverse lookups and id allocation.
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_relationships_id
+                ON relationships(id)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_relationships_target
+                ON relationships(target_id, relationship_type, source_id)
+            ''')
+            
+            # Expose selected JSON properties as indexed generated columns.
+            # They are declared without a type so json_extract's own type is
+            # kept and indexed lookups compare like the json_extract scan.
+            columns = {row['name']: row['type'] for row in cursor.execute('PRAGMA table_xinfo(entities)')}
+            for key in sorted(self.indexed_properties):
+                if columns.get(f'prop_{key}'):
+                    # Columns written with TEXT affinity turned 30 into '30'
+                    cursor.execute(f'DROP INDEX IF EXISTS idx_prop_{key}')
+                    cursor.execute(f'ALTER TABLE entities DROP COLUMN prop_{key}')
+                    del columns[f'prop_{key}']
+                if f'prop_{key}' not in columns:
+                    cursor.execute(f'''
+                        ALTER TABLE entities ADD COLUMN prop_{key}
+                        GENERATED ALWAYS AS (json_extract(properties, '$.{key}')) VIRTUAL
+                    ''')
+                cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_prop_{key} ON entities(prop_{key})')
+    
+    def close(self):
+        """Refresh planner statistics and close all pooled database connections.
         
-        self.conn.commit()
+        In-memory graphs are snapshotted to ``db_path`` one last time first.
+        """
+        self.optimize()
+        if self._snapshot_thread is not None:
+            self._snapshot_stop.set()
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+            self.snapshot()
+        self._pool.close()
+    
+    def _load_snapshot(self):
+        """Seed the in-memory database from an existing file at db_path."""
+        if not os.path.exists(self.db_path):
+            return
+        disk = sqlite3.connect(self.db_path)
+        try:
+            with self._pool.connection() as conn:
+                disk.backup(conn)
+        finally:
+            disk.close()
+    
+    def _snapshot_loop(self):
+        while not self._snapshot_stop.wait(self.snapshot_interval):
+            self.snapshot()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy the in-memory database to db_path."""
+        if not self.in_memory:
+            return {"success": False, "error": "Snapshots are only used for in-memory graphs"}
+        try:
+            disk = sqlite3.connect(self.db_path)
+            try:
+                with self._pool.connection() as conn:
+                    conn.backup(disk)
+            finally:
+                disk.close()
+            return {"success": True, "path": self.db_path}
+        except Exception as e:
+            logger.error(f"Error snapshotting database: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def optimize(self) -> Dict[str, Any]:
+        """Refresh the query planner statistics used to pick relationship indexes."""
+        try:
+            with self._pool.connection() as conn:
+                conn.execute('ANALYZE')
+                conn.execute('PRAGMA optimize')
+            return {"success": True}
+        except Exception as e:
+            logger.error(f"Error optimizing database: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def vacuum(self) -> Dict[str, Any]:
+        """Rebuild the database file to reclaim free pages."""
+        try:
+            with self._pool.connection() as conn:
+                conn.execute('VACUUM')
+            return {"success": True}
+        except Exception as e:
+            logger.error(f"Error vacuuming database: {e}")
+            return {"success": False, "error": str(e)}
     
     def add_entity(self, name: str, entity_type: str, properties: Optional[Dict] = None) -> Dict[str, Any]:
         """Add an entity to the knowledge graph."""
         try:
-            cursor = self.conn.cursor()
-            props_json = json.dumps(properties or {})
+            props_json = _dumps(properties or {})
             now = datetime.now().isoformat()
             
-            cursor.execute('''
-                INSERT OR REPLACE INTO entities (name, entity_type, properties, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (name, entity_type, props_json, now, now))
+            with self._pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(SQL_INSERT_ENTITY, (name, entity_type, props_json, now, now))
+                entity_id = cursor.lastrowid
             
-            self.conn.commit()
-            entity_id = cursor.lastrowid
+            self._cache_entity_id(name, entity_id)
             
             return {
                 "success": True,
@@ -94,30 +412,117 @@ class KnowledgeGraphTool:
             logger.error(f"Error adding entity: {e}")
             return {"success": False, "error": str(e)}
     
+    def add_entities_bulk(self, entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add many entities in a single transaction.
+        
+        Each item needs ``name`` and ``entity_type`` and may carry ``properties``.
+        """
+        try:
+            now = datetime.now().isoformat()
+            rows = [
+                (item['name'], item['entity_type'], _dumps(item.get('properties') or {}), now, now)
+                for item in entities
+            ]
+            
+            with self._pool.connection() as conn:
+                conn.execute('BEGIN')
+                try:
+                    conn.executemany(SQL_INSERT_ENTITY, rows)
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+            
+            # Replaced rows get new ids, so drop any cached ones
+            with self._lock:
+                for row in rows:
+                    self._entity_ids.pop(row[0], None)
+            
+            self.optimize()
+            return {"success": True, "added": len(rows)}
+        except Exception as e:
+            logger.error(f"Error adding entities: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def _cache_entity_id(self, name: str, entity_id: int):
+        """Remember an entity id, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entity_ids[name] = entity_id
+            self._entity_ids.move_to_end(name)
+            if len(self._entity_ids) > ENTITY_ID_CACHE_SIZE:
+                self._entity_ids.popitem(last=False)
+    
+    def _get_entity_id(self, name: str) -> Optional[int]:
+        """Resolve an entity name to its id, using the LRU cache when possible."""
+        with self._lock:
+            entity_id = self._entity_ids.get(name)
+            if entity_id is not None:
+                self._entity_ids.move_to_end(name)
+                return entity_id
+        
+        with self._pool.connection() as conn:
+            row = conn.execute(SQL_GET_ID, (name,)).fetchone()
+        if not row:
+            return None
+        
+        self._cache_entity_id(name, row['id'])
+        return row['id']
+    
+    def _get_entity_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """Resolve several entity names at once, querying only the uncached ones."""
+        ids = {}
+        missing = []
+        with self._lock:
+            for name in set(names):
+                entity_id = self._entity_ids.get(name)
+                if entity_id is not None:
+                    self._entity_ids.move_to_end(name)
+                    ids[name] = entity_id
+                else:
+                    missing.append(name)
+        
+        if not missing:
+            return ids
+        
+        found = {}
+        with self._pool.connection() as conn:
+            for start in range(0, len(missing), NAME_LOOKUP_BATCH_SIZE):
+                batch = missing[start:start + NAME_LOOKUP_BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                for row in conn.execute(f'SELECT name, id FROM entities WHERE name IN ({placeholders})', batch):
+                    found[row['name']] = row['id']
+        
+        # Cache only after the connection is back in the pool: _get_adjacency
+        # never holds the lock while waiting for a connection, and this keeps
+        # the reverse order from happening here
+        for name, entity_id in found.items():
+            self._cache_entity_id(name, entity_id)
+        ids.update(found)
+        return ids
+    
     def add_relationship(self, source_name: str, target_name: str, 
                         relationship_type: str, strength: float = 1.0,
                         properties: Optional[Dict] = None) -> Dict[str, Any]:
         """Add a relationship between two entities."""
         try:
-            cursor = self.conn.cursor()
+            ids = self._get_entity_ids((source_name, target_name))
+            source_id = ids.get(source_name)
+            target_id = ids.get(target_name)
             
-            # Get entity IDs
-            cursor.execute('SELECT id FROM entities WHERE name = ?', (source_name,))
-            source = cursor.fetchone()
-            cursor.execute('SELECT id FROM entities WHERE name = ?', (target_name,))
-            target = cursor.fetchone()
-            
-            if not source or not target:
+            if source_id is None or target_id is None:
                 return {"success": False, "error": "Source or target entity not found"}
             
-            props_json = json.dumps(properties or {})
+            props_json = _dumps(properties or {})
             
-            cursor.execute('''
-                INSERT INTO relationships (source_id, target_id, relationship_type, strength, properties, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (source['id'], target['id'], relationship_type, strength, props_json, datetime.now().isoformat()))
+            with self._pool.connection() as conn:
+                conn.execute(SQL_INSERT_RELATIONSHIP, (source_id, target_id, relationship_type, strength, props_json, datetime.now().isoformat()))
             
-            self.conn.commit()
+            with self._lock:
+                self._graph_version += 1
+                self._csr = None
+                if self._adjacency is not None:
+                    self._adjacency[source_id].append(target_id)
+                    self._adjacency[target_id].append(source_id)
             
             return {
                 "success": True,
@@ -130,96 +535,275 @@ class KnowledgeGraphTool:
             logger.error(f"Error adding relationship: {e}")
             return {"success": False, "error": str(e)}
     
-    def query_entity(self, name: str, include_relationships: bool = True) -> Dict[str, Any]:
-        """Query an entity and its relationships."""
+    def add_relationships_bulk(self, relationships: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add many relationships in a single transaction.
+        
+        Each item needs ``source_name``, ``target_name`` and ``relationship_type``
+        and may carry ``strength`` and ``properties``. Items whose entities do
+        not exist are skipped.
+        """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT * FROM entities WHERE name = ?', (name,))
-            entity = cursor.fetchone()
+            now = datetime.now().isoformat()
+            ids = self._get_entity_ids(
+                name for item in relationships for name in (item['source_name'], item['target_name'])
+            )
+            rows = []
+            skipped = []
+            for item in relationships:
+                source_id = ids.get(item['source_name'])
+                target_id = ids.get(item['target_name'])
+                if source_id is None or target_id is None:
+                    skipped.append(item)
+                    continue
+                rows.append((source_id, target_id, item['relationship_type'],
+                             item.get('strength', 1.0), _dumps(item.get('properties') or {}), now))
             
-            if not entity:
-                return {"success": False, "error": f"Entity '{name}' not found"}
+            with self._pool.connection() as conn:
+                conn.execute('BEGIN')
+                try:
+                    conn.executemany(SQL_INSERT_RELATIONSHIP, rows)
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
             
-            result = dict(entity)
-            result['properties'] = json.loads(result['properties'])
-            
-            if include_relationships:
-                # Get outgoing relationships
-                cursor.execute('''
-                    SELECT r.*, e.name as target_name, e.entity_type as target_type
-                    FROM relationships r
-                    JOIN entities e ON r.target_id = e.id
-                    WHERE r.source_id = ?
-                ''', (entity['id'],))
-                result['outgoing'] = [dict(row) for row in cursor.fetchall()]
+            with self._lock:
+                self._graph_version += 1
+                self._csr = None
+                if self._adjacency is not None:
+                    for source_id, target_id, *_ in rows:
+                        self._adjacency[source_id].append(target_id)
+                        self._adjacency[target_id].append(source_id)
+            
+            self.optimize()
+            return {"success": True, "added": len(rows), "skipped": len(skipped)}
+        except Exception as e:
+            logger.error(f"Error adding relationships: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def query_entity(self, name: str, include_relationships: bool = True) -> Dict[str, Any]:
+        """Query an entity and its relationships."""
+        try:
+            with self._pool.connection() as conn:
+                # Plain tuples zipped with fixed key tuples avoid sqlite3.Row overhead
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                cursor.execute(SQL_SELECT_ENTITY, (name,))
+                entity = cursor.fetchone()
+                
+                if not entity:
+                    return {"success": False, "error": f"Entity '{name}' not found"}
+                
+                result = dict(zip(ENTITY_COLUMNS, entity))
+                result['properties'] = _loads(result['properties'])
+                entity_id = result['id']
                 
-                # Get incoming relationships
-                cursor.execute('''
-                    SELECT r.*, e.name as source_name, e.entity_type as source_type
-                    FROM relationships r
-                    JOIN entities e ON r.source_id = e.id
-                    WHERE r.target_id = ?
-                ''', (entity['id'],))
-                result['incoming'] = [dict(row) for row in cursor.fetchall()]
+                if include_relationships:
+                    # Get outgoing relationships
+                    cursor.execute(SQL_OUTGOING, (entity_id,))
+                    result['outgoing'] = [dict(zip(OUTGOING_COLUMNS, row)) for row in cursor.fetchall()]
+                    
+                    # Get incoming relationships
+                    cursor.execute(SQL_INCOMING, (entity_id,))
+                    result['incoming'] = [dict(zip(INCOMING_COLUMNS, row)) for row in cursor.fetchall()]
             
             return {"success": True, "entity": result}
         except Exception as e:
             logger.error(f"Error querying entity: {e}")
             return {"success": False, "error": str(e)}
     
+    def get_entity_property(self, name: str, key: str) -> Dict[str, Any]:
+        """Get a single property of an entity without decoding the whole JSON blob."""
+        try:
+            with self._pool.connection() as conn:
+                row = conn.execute(SQL_ENTITY_PROPERTY, (f'$."{key}"', name)).fetchone()
+            
+            if not row:
+                return {"success": False, "error": f"Entity '{name}' not found"}
+            
+            return {"success": True, "name": name, "key": key, "value": row['value']}
+        except Exception as e:
+            logger.error(f"Error getting entity property: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def find_entities_by_property(self, key: str, value: Any) -> Dict[str, Any]:
+        """Find entities whose property ``key`` equals ``value``.
+        
+        Uses the generated-column index for keys passed as ``indexed_properties``
+        and falls back to a json_extract scan otherwise.
+        """
+        try:
+            with self._pool.connection() as conn:
+                if key in self.indexed_properties:
+                    cursor = conn.execute(
+                        f'SELECT name, entity_type, properties FROM entities WHERE prop_{key} = ?',
+                        (value,)
+                    )
+                else:
+                    cursor = conn.execute(SQL_FIND_BY_PROPERTY, (f'$."{key}"', value))
+                entities = [
+                    {"name": row['name'], "entity_type": row['entity_type'],
+                     "properties": _loads(row['properties'])}
+                    for row in cursor.fetchall()
+                ]
+            
+            return {"success": True, "entities": entities, "count": len(entities)}
+        except Exception as e:
+            logger.error(f"Error finding entities by property: {e}")
+            return {"success": False, "error": str(e)}
+    
+    def _get_adjacency(self) -> Dict[int, List[int]]:
+        """Return the undirected adjacency list, loading it from the database once."""
+        with self._lock:
+            if self._adjacency is not None:
+                return self._adjacency
+            version = self._graph_version
+        
+        # Load without the lock: waiting for a pooled connection while holding
+        # it deadlocks against a thread that holds the connection and wants it
+        adjacency = defaultdict(list)
+        with self._pool.connection() as conn:
+            for source_id, target_id in conn.execute(SQL_ADJACENCY):
+                adjacency[source_id].append(target_id)
+                adjacency[target_id].append(source_id)
+        
+        with self._lock:
+            if self._adjacency is not None:
+                return self._adjacency
+            # A relationship written during the load may be missing from it;
+            # use it for this call but leave the next one to reload
+            if self._graph_version == version:
+                self._adjacency = adjacency
+            return adjacency
+    
+    def _get_csr(self):
+        """Return the adjacency list as NumPy CSR arrays ``(indptr, indices)``."""
+        adjacency = self._get_adjacency()
+        with self._lock:
+            if self._csr is not None and adjacency is self._adjacency:
+                return self._csr
+            size = max(adjacency) + 1 if adjacency else 1
+            indptr = np.zeros(size + 1, dtype=np.int32)
+            for node_id, neighbors in adjacency.items():
+                indptr[node_id + 1] = len(neighbors)
+            np.cumsum(indptr, out=indptr)
+            indices = np.empty(indptr[-1], dtype=np.int32)
+            for node_id, neighbors in adjacency.items():
+                indices[indptr[node_id]:indptr[node_id + 1]] = neighbors
+            # Only arrays built from the cached adjacency list are kept
+            if adjacency is self._adjacency:
+                self._csr = (indptr, indices)
+            return indptr, indices
+    
+    def _compiled_search(self, source_id: int, target_id: int, max_hops: int) -> Optional[List[int]]:
+        """Find a shortest path with the numba-compiled CSR breadth-first search."""
+        if source_id == target_id:
+            return [source_id]
+        
+        indptr, indices = self._get_csr()
+        size = len(indptr) - 1
+        if source_id >= size or target_id >= size:
+            return None
+        
+        parent = np.full(size, -1, dtype=np.int32)
+        frontier = np.empty(size, dtype=np.int32)
+        if _csr_shortest_path_jit(indptr, indices, parent, frontier, source_id, target_id, max_hops) < 0:
+            return None
+        
+        path = [target_id]
+        while path[-1] != source_id:
+            path.append(int(parent[path[-1]]))
+        path.reverse()
+        return path
+    
+    @staticmethod
+    def _bidirectional_search(adjacency: Dict[int, List[int]], source_id: int,
+                              target_id: int, max_hops: int) -> Optional[List[int]]:
+        """
+        Find a shortest path of at most ``max_hops`` edges between two ids.
+        
+        Expands the smaller of the forward and backward frontiers one level at a
+        time and stops as soon as they meet, so only about 2*b^(d/2) nodes are
+        visited instead of b^d.
+        """
+        if source_id == target_id:
+            return [source_id]
+        
+        forward = {source_id: None}
+        backward = {target_id: None}
+        forward_frontier = [source_id]
+        backward_frontier = [target_id]
+        hops = 0
+        
+        while forward_frontier and backward_frontier and hops < max_hops:
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier, parents, other = forward_frontier, forward, backward
+            else:
+                frontier, parents, other = backward_frontier, backward, forward
+            
+            next_frontier = []
+            meeting_id = None
+            for node_id in frontier:
+                for neighbor_id in adjacency.get(node_id, ()):
+                    if neighbor_id in parents:
+                        continue
+                    parents[neighbor_id] = node_id
+                    if neighbor_id in other:
+                        meeting_id = neighbor_id
+                        break
+                    next_frontier.append(neighbor_id)
+                if meeting_id is not None:
+                    break
+            
+            if meeting_id is not None:
+                path = []
+                node_id = meeting_id
+                while node_id is not None:
+                    path.append(node_id)
+                    node_id = forward[node_id]
+                path.reverse()
+                node_id = backward[meeting_id]
+                while node_id is not None:
+                    path.append(node_id)
+                    node_id = backward[node_id]
+                return path
+            
+            if parents is forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+            hops += 1
+        
+        return None
+    
     def find_path(self, source_name: str, target_name: str, max_depth: int = 5) -> Dict[str, Any]:
         """Find shortest path between two entities."""
         try:
-            cursor = self.conn.cursor()
-            
-            # Get entity IDs
-            cursor.execute('SELECT id FROM entities WHERE name = ?', (source_name,))
-            source = cursor.fetchone()
-            cursor.execute('SELECT id FROM entities WHERE name = ?', (target_name,))
-            target = cursor.fetchone()
+            ids = self._get_entity_ids((source_name, target_name))
+            source_id = ids.get(source_name)
+            target_id = ids.get(target_name)
             
-            if not source or not target:
+            if source_id is None or target_id is None:
                 return {"success": False, "error": "Source or target entity not found"}
             
-            # BFS to find shortest path
-            visited = set()
-            queue = [(source['id'], [source['id']])]
+            if _csr_shortest_path_jit is not None:
+                path = self._compiled_search(source_id, target_id, max_depth - 1)
+            else:
+                path = self._bidirectional_search(self._get_adjacency(), source_id, target_id, max_depth - 1)
             
-            while queue:
-                current_id, path = queue.pop(0)
-                
-                if current_id == target['id']:
-                    # Reconstruct path with entity names
-                    path_names = []
-                    for entity_id in path:
-                        cursor.execute('SELECT name FROM entities WHERE id = ?', (entity_id,))
-                        path_names.append(cursor.fetchone()['name'])
-                    
-                    return {
-                        "success": True,
-                        "path": path_names,
-                        "length": len(path_names) - 1
-                    }
+            if path is not None:
+                # Reconstruct path with entity names in a single query
+                placeholders = ','.join('?' * len(path))
+                with self._pool.connection() as conn:
+                    rows = conn.execute(f'SELECT id, name FROM entities WHERE id IN ({placeholders})', path)
+                    names = {row['id']: row['name'] for row in rows}
+                path_names = [names[entity_id] for entity_id in path]
                 
-                if len(path) >= max_depth:
-                    continue
-                
-                if current_id in visited:
-                    continue
-                
-                visited.add(current_id)
-                
-                # Get neighbors
-                cursor.execute('''
-                    SELECT target_id FROM relationships WHERE source_id = ?
-                    UNION
-                    SELECT source_id FROM relationships WHERE target_id = ?
-                ''', (current_id, current_id))
-                
-                for row in cursor.fetchall():
-                    neighbor_id = row[0]
-                    if neighbor_id not in visited:
-                        queue.append((neighbor_id, path + [neighbor_id]))
+                return {
+                    "success": True,
+                    "path": path_names,
+                    "length": len(path_names) - 1
+                }
             
             return {"success": True, "path": None, "message": "No path found"}
         except Exception as e:
@@ -229,29 +813,19 @@ class KnowledgeGraphTool:
     def get_neighbors(self, name: str, relationship_type: Optional[str] = None) -> Dict[str, Any]:
         """Get all neighboring entities."""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT id FROM entities WHERE name = ?', (name,))
-            entity = cursor.fetchone()
+            entity_id = self._get_entity_id(name)
             
-            if not entity:
+            if entity_id is None:
                 return {"success": False, "error": f"Entity '{name}' not found"}
             
-            sql = '''
-                SELECT DISTINCT e.name, e.entity_type, r.relationship_type
-                FROM relationships r
-                JOIN entities e ON (r.target_id = e.id OR r.source_id = e.id)
-                WHERE (r.source_id = ? OR r.target_id = ?)
-                AND e.id != ?
-            '''
-            
-            params = [entity['id'], entity['id'], entity['id']]
-            
-            if relationship_type:
-                sql += ' AND r.relationship_type = ?'
-                params.append(relationship_type)
-            
-            cursor.execute(sql, params)
-            neighbors = [dict(row) for row in cursor.fetchall()]
+            with self._pool.connection() as conn:
+                if relationship_type:
+                    cursor = conn.execute(SQL_NEIGHBORS_BY_TYPE,
+                                          (entity_id, entity_id, relationship_type,
+                                           entity_id, entity_id, relationship_type))
+                else:
+                    cursor = conn.execute(SQL_NEIGHBORS, (entity_id, entity_id, entity_id, entity_id))
+                neighbors = [dict(row) for row in cursor.fetchall()]
             
             return {"success": True, "neighbors": neighbors, "count": len(neighbors)}
         except Exception as e:
@@ -331,7 +905,6 @@ OPENAI_FUNCTIONS = [
 if __name__ == "__main__":
     # Example usage
     import tempfile
-    import os
     
     db_file = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
     db_path = db_file.name
@@ -362,6 +935,7 @@ if __name__ == "__main__":
         result = kg.find_path("Python", "AI")
         print(json.dumps(result, indent=2))
         
+        kg.close()
     finally:
         os.unlink(db_path)
         print(f"\nCleaned up: {db_path}")
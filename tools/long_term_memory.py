@@ -11,16 +11,332 @@ OpenAI Compatible: Yes
 import json
 import sqlite3
 import gzip
-from datetime import datetime, timedelta
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-import hashlib
+from queue import Empty, Queue
+from typing import Dict, List, Any, Optional, Iterator, Callable, Tuple
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Connection PRAGMAs applied on open; override per instance via ``pragmas``
+# (set a key to None to skip it, e.g. journal_mode for ':memory:' databases)
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -64000,
+    "mmap_size": 268435456,
+    "busy_timeout": 5000,
+}
+
+
+# Bumped whenever _initialize_database needs to migrate an existing file
+SCHEMA_VERSION = 4
+
+# Rows per multi-VALUES INSERT in store_many (8 parameters each, kept
+# below SQLite's historical 999 bound-parameter limit)
+STORE_MANY_BATCH_SIZE = 120
+
+# Content shorter than this (in UTF-8 bytes) is stored as plain TEXT, since
+# compression framing would outweigh the savings
+COMPRESS_MIN_BYTES = 256
+COMPRESSION_LEVEL = 3
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+# Size of the per-connection prepared statement cache (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Hot-path statements, kept as constants so the SQL text is identical on
+# every call and hits the connection's statement cache
+SQL_BULK_INSERT_MEMORY = (
+    "INSERT INTO memories (content, content_type, importance, context, tags, "
+    "created_at, last_accessed, content_len) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_INSERT_MEMORY = SQL_BULK_INSERT_MEMORY + " RETURNING id"
+
+# Porter stemming over unicode61 so "running" matches "run"; diacritics are
+# folded so "cafe" matches "café"
+FTS_TABLE_SQL = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+        content, context, tags, content='',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+'''
+
+# Insert-side sync triggers; bulk_load drops them for the load and instead
+# indexes the new id range with the set-based SQL_INDEX_* statements
+TAGS_INSERT_TRIGGER_SQL = '''
+    CREATE TRIGGER IF NOT EXISTS memory_tags_ai AFTER INSERT ON memories BEGIN
+        INSERT OR IGNORE INTO memory_tags (memory_id, tag)
+        SELECT new.id, value FROM json_each(new.tags);
+    END;
+'''
+FTS_INSERT_TRIGGER_SQL = '''
+    CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+        INSERT INTO memories_fts(rowid, content, context, tags)
+        VALUES (new.id, memory_text(new.content), new.context, new.tags);
+    END;
+'''
+SQL_INDEX_TAGS = '''
+    INSERT OR IGNORE INTO memory_tags (memory_id, tag)
+    SELECT m.id, j.value FROM memories m, json_each(m.tags) j
+    WHERE m.id > ? AND m.tags IS NOT NULL
+'''
+SQL_INDEX_FTS = '''
+    INSERT INTO memories_fts(rowid, content, context, tags)
+    SELECT id, memory_text(content), context, tags FROM memories
+    WHERE id > ?
+'''
+
+SQL_SELECT_MEMORY = "SELECT * FROM memories WHERE id = ?"
+SQL_UPDATE_ACCESS = (
+    "UPDATE memories SET access_count = access_count + ?, last_accessed = ? WHERE id = ?"
+)
+
+# Buffered retrieve() accesses are written back after this many reads
+ACCESS_FLUSH_INTERVAL = 100
+
+# retrieve() keeps this many recently read memories for RETRIEVE_CACHE_TTL
+# seconds; cached copies may lag behind buffered access counts
+RETRIEVE_CACHE_SIZE = 512
+RETRIEVE_CACHE_TTL = 5.0
+
+# Rows fetched per query by the iter_* generators. The read connection (or
+# the write lock) is released before a batch is yielded, and the next batch
+# continues after the last row's sort key
+FETCH_BATCH_SIZE = 64
+
+US_PER_DAY = 86400 * 1_000_000
+
+# get_stats() importance categories, indexed by importance_bucket
+IMPORTANCE_BUCKETS = ('low', 'medium', 'high')
+IMPORTANCE_BUCKET_COLUMN = (
+    "importance_bucket INTEGER GENERATED ALWAYS AS "
+    "(CASE WHEN importance >= 0.8 THEN 2 WHEN importance >= 0.5 THEN 1 ELSE 0 END) VIRTUAL"
+)
+
+# Timestamps are stored as INTEGER unix epoch microseconds; content holds
+# TEXT or a compressed BLOB (see _pack_content) and content_len its UTF-8 size
+MEMORIES_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        content TEXT NOT NULL,
+        content_type TEXT,
+        importance REAL DEFAULT 0.5,
+        context TEXT,
+        tags TEXT,
+        created_at INTEGER NOT NULL,
+        last_accessed INTEGER,
+        access_count INTEGER DEFAULT 0,
+        archived BOOLEAN DEFAULT 0,
+        content_len INTEGER,
+        {bucket_column}
+    )
+'''
+
+
+def _now_us() -> int:
+    """Current time as unix epoch microseconds."""
+    return time.time_ns() // 1000
+
+
+def _iso_to_us(value: Optional[str]) -> Optional[int]:
+    """Convert a legacy ISO-8601 timestamp to epoch microseconds."""
+    if value is None:
+        return None
+    return int(datetime.fromisoformat(value).timestamp() * 1_000_000)
+
+
+@lru_cache(maxsize=1024)
+def _us_to_iso(value: Optional[int]) -> Optional[str]:
+    """
+    Format epoch microseconds as ISO-8601 local time for API responses.
+    
+    Cached because rows share timestamps: store_many stamps a whole batch with
+    one value and unread memories have last_accessed == created_at.
+    """
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value / 1_000_000).isoformat()
+
+
+def _pack_content(content: str) -> Any:
+    """Compress content for storage with zstd (gzip without zstandard); short text is kept as-is."""
+    data = content.encode('utf-8')
+    if len(data) < COMPRESS_MIN_BYTES:
+        return content
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=COMPRESSION_LEVEL)
+
+
+def _unpack_content(value: Any) -> Optional[str]:
+    """Inverse of _pack_content; plain TEXT values are returned unchanged."""
+    if not isinstance(value, bytes):
+        return value
+    if value.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed memories")
+        return zstandard.ZstdDecompressor().decompress(value).decode('utf-8')
+    return gzip.decompress(value).decode('utf-8')
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize tags to JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _loads(data: str) -> Any:
+    """Parse JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=32)
+def _compile_search_sql(has_content_type: bool, n_tags: int, after: bool = False) -> str:
+    """
+    Build the search() SQL for one filter shape.
+    
+    The text is identical for every call with the same shape, so it hits the
+    connection's prepared-statement cache. Parameters, in order: query, FTS
+    limit, min_importance, [content_type], [tags...], [rank, -importance,
+    -last_accessed, id of the previous batch's last row when after], limit.
+    """
+    # Rank FTS matches on their own first so the MATCH keeps its index
+    # plan, then join and filter
+    sql = '''
+        WITH fts AS (
+            SELECT rowid, rank FROM memories_fts
+            WHERE memories_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        )
+        SELECT m.*, fts.rank
+        FROM fts
+        JOIN memories m ON m.id = fts.rowid
+        WHERE m.importance >= ?
+    '''
+    if has_content_type:
+        sql += ' AND m.content_type = ?'
+    if n_tags:
+        # Check if any tag matches
+        placeholders = ','.join('?' * n_tags)
+        sql += f' AND m.id IN (SELECT memory_id FROM memory_tags WHERE tag IN ({placeholders}))'
+    if after:
+        sql += ' AND (fts.rank, -m.importance, -m.last_accessed, m.id) > (?, ?, ?, ?)'
+    sql += ' ORDER BY fts.rank, -m.importance, -m.last_accessed, m.id LIMIT ?'
+    return sql
+
+
+@lru_cache(maxsize=32)
+def _compile_tags_sql(n_tags: int, match_all: bool, after: bool = False) -> str:
+    """
+    Build the get_by_tags() SQL for one shape.
+    
+    Parameters, in order: tags..., [importance, last_accessed, id of the
+    previous batch's last row when after], [tag count when match_all], limit.
+    """
+    placeholders = ','.join('?' * n_tags)
+    sql = f'''
+        SELECT m.* FROM memories m
+        JOIN memory_tags t ON t.memory_id = m.id
+        WHERE t.tag IN ({placeholders})
+    '''
+    if after:
+        sql += ' AND (m.importance, m.last_accessed, m.id) < (?, ?, ?)'
+    sql += ' GROUP BY m.id'
+    if match_all:
+        # All tags must match
+        sql += ' HAVING COUNT(DISTINCT t.tag) = ?'
+    sql += ' ORDER BY m.importance DESC, m.last_accessed DESC, m.id DESC LIMIT ?'
+    return sql
+
+
+def _serialized(method):
+    """Run a method under the instance write lock (one writer connection, many threads)."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class ReadConnectionPool:
+    """
+    Thread-safe pool of read-only SQLite connections.
+    
+    With WAL journaling readers never block the writer or each other, so
+    queries from several threads run in parallel instead of queueing on the
+    single writer connection. Connections are opened lazily up to ``size``.
+    """
+    
+    def __init__(self, db_path: str, size: int = 4, pragmas: Optional[Dict[str, Any]] = None):
+        self.uri = Path(db_path).absolute().as_uri() + '?mode=ro'
+        self.size = size
+        # journal_mode can only be changed by a writer
+        self.pragmas = {name: value for name, value in (pragmas or {}).items()
+                        if name != 'journal_mode' and value is not None}
+        self._idle = Queue()
+        self._opened = 0
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.uri, uri=True, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, returning it to the pool when done."""
+        try:
+            conn = self._idle.get_nowait()
+        except Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            conn = self._connect() if can_open else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+    
+    def close(self):
+        """Close every idle connection in the pool."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
 
 class LongTermMemoryTool:
     """
@@ -35,79 +351,203 @@ class LongTermMemoryTool:
     - Tag-based organization
     """
     
-    def __init__(self, db_path: str = "./long_term_memory.db", max_entries: int = 10000):
+    def __init__(self, db_path: str = "./long_term_memory.db", max_entries: int = 10000,
+                 pragmas: Optional[Dict[str, Any]] = None, prune_slack: int = 64,
+                 read_pool_size: int = 4):
         """
         Initialize long-term memory.
         
         Args:
             db_path: Path to SQLite database
-            max_entries: Maximum number of entries before pruning
+            max_entries: Target number of entries; pruning keeps the count
+                within prune_slack of it rather than as a hard maximum
+            pragmas: Overrides for DEFAULT_PRAGMAS (None values are skipped)
+            prune_slack: Entries allowed above max_entries before pruning, which
+                then trims to max_entries - prune_slack (capped at
+                max_entries // 16, at least 1)
+            read_pool_size: Read-only connections for concurrent queries (0 reads
+                through the writer; always 0 for ':memory:' databases)
         """
         self.db_path = db_path
         self.max_entries = max_entries
+        self.prune_slack = max(0, min(prune_slack, max(1, max_entries // 16)))
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
         self.conn = None
+        self._write_lock = threading.RLock()
+        self._active_count = 0
+        # memory_id -> [pending access count, last access time]
+        self._access_buf: Dict[int, List[int]] = {}
+        self._pending_reads = 0
+        # memory_id -> (monotonic load time, memory dict), least recent first
+        self._retrieve_cache: "OrderedDict[int, tuple]" = OrderedDict()
         self._initialize_database()
         
+        # Readers are opened after the schema exists; an in-memory database
+        # is private to its connection, so it has no separate readers
+        self._read_pool = None
+        if read_pool_size > 0 and db_path != ':memory:':
+            self._read_pool = ReadConnectionPool(db_path, read_pool_size, self.pragmas)
+        
         logger.info(f"LongTermMemory initialized: db={db_path}, max_entries={max_entries}")
     
     def _initialize_database(self):
         """Initialize SQLite database with required tables."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE,
+                                        check_same_thread=False)
             self.conn.row_factory = sqlite3.Row
+            # Triggers decompress content through this to keep the FTS index in sync
+            self.conn.create_function('memory_text', 1, _unpack_content, deterministic=True)
+            for name, value in self.pragmas.items():
+                if value is not None:
+                    self.conn.execute(f"PRAGMA {name}={value}")
             cursor = self.conn.cursor()
             
+            # Migrate databases written before the current schema version
+            cursor.execute('PRAGMA user_version')
+            version = cursor.fetchone()[0]
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memories'")
+            if cursor.fetchone() is not None:
+                if version < 1:
+                    self._migrate_integer_timestamps(cursor)
+                if version < 2:
+                    self._migrate_compressed_content(cursor)
+                if version < 3:
+                    self._rebuild_fts(cursor)
+                if version < 4:
+                    self._migrate_importance_bucket(cursor)
+            
             # Create memories table
+            cursor.execute(MEMORIES_TABLE_SQL.format(name='memories', bucket_column=IMPORTANCE_BUCKET_COLUMN))
+            
+            # Create indexes for recency, filtered search, stats and pruning order
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_bucket'")
+            new_indexes = cursor.fetchone() is None
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON memories(created_at DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_type_imp ON memories(content_type, importance DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_bucket ON memories(importance_bucket)')
             cursor.execute('''
-                CREATE TABLE IF NOT EXISTS memories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    content TEXT NOT NULL,
-                    content_type TEXT,
-                    importance REAL DEFAULT 0.5,
-                    context TEXT,
-                    tags TEXT,
-                    created_at TEXT NOT NULL,
-                    last_accessed TEXT,
-                    access_count INTEGER DEFAULT 0,
-                    archived BOOLEAN DEFAULT 0
-                )
+                CREATE INDEX IF NOT EXISTS idx_prune
+                ON memories(archived, importance, access_count, last_accessed)
             ''')
             
-            # Create full-text search index
+            # Create normalized tag table, kept in sync by triggers below
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memory_tags'")
+            backfill_tags = cursor.fetchone() is None
             cursor.execute('''
-                CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
-                    content, context, tags, content=memories, content_rowid=id
-                )
+                CREATE TABLE IF NOT EXISTS memory_tags (
+                    memory_id INTEGER NOT NULL,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (memory_id, tag)
+                ) WITHOUT ROWID
             ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tag ON memory_tags(tag, memory_id)')
+            if backfill_tags:
+                cursor.execute(SQL_INDEX_TAGS, (0,))
+            
+            cursor.execute(TAGS_INSERT_TRIGGER_SQL)
             
-            # Create triggers to keep FTS in sync
             cursor.execute('''
-                CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
-                    INSERT INTO memories_fts(rowid, content, context, tags)
-                    VALUES (new.id, new.content, new.context, new.tags);
+                CREATE TRIGGER IF NOT EXISTS memory_tags_ad AFTER DELETE ON memories BEGIN
+                    DELETE FROM memory_tags WHERE memory_id = old.id;
                 END;
             ''')
             
+            # Create full-text search index (contentless: only the index is
+            # kept, rows are read back from memories)
+            cursor.execute(FTS_TABLE_SQL)
+            
+            # Create triggers to keep FTS in sync; a contentless index needs
+            # the original text to delete a row
+            cursor.execute(FTS_INSERT_TRIGGER_SQL)
+            
             cursor.execute('''
                 CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
-                    DELETE FROM memories_fts WHERE rowid = old.id;
+                    INSERT INTO memories_fts(memories_fts, rowid, content, context, tags)
+                    VALUES ('delete', old.id, memory_text(old.content), old.context, old.tags);
                 END;
             ''')
             
+            # Only indexed columns re-index; access tracking updates skip FTS
             cursor.execute('''
-                CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories BEGIN
-                    UPDATE memories_fts SET content = new.content, context = new.context, tags = new.tags
-                    WHERE rowid = old.id;
+                CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE OF content, context, tags ON memories BEGIN
+                    INSERT INTO memories_fts(memories_fts, rowid, content, context, tags)
+                    VALUES ('delete', old.id, memory_text(old.content), old.context, old.tags);
+                    INSERT INTO memories_fts(rowid, content, context, tags)
+                    VALUES (new.id, memory_text(new.content), new.context, new.tags);
                 END;
             ''')
             
+            # Gather statistics so the planner considers the new indexes
+            if new_indexes:
+                cursor.execute('ANALYZE')
+            
+            cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
             self.conn.commit()
+            
+            # Unarchived row count, kept in process so store() avoids a COUNT(*) per insert
+            cursor.execute('SELECT COUNT(*) FROM memories WHERE archived = 0')
+            self._active_count = cursor.fetchone()[0]
             logger.info("Database initialized successfully")
             
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
             raise
     
+    def _migrate_integer_timestamps(self, cursor: sqlite3.Cursor):
+        """Rebuild a legacy memories table, converting ISO timestamps to epoch microseconds."""
+        logger.info("Migrating memory timestamps to integer microseconds")
+        self.conn.create_function('iso_to_us', 1, _iso_to_us)
+        cursor.execute(MEMORIES_TABLE_SQL.format(name='memories_migrated', bucket_column=IMPORTANCE_BUCKET_COLUMN))
+        cursor.execute('''
+            INSERT INTO memories_migrated
+                (id, content, content_type, importance, context, tags,
+                 created_at, last_accessed, access_count, archived)
+            SELECT id, content, content_type, importance, context, tags,
+                   iso_to_us(created_at), iso_to_us(last_accessed), access_count, archived
+            FROM memories
+        ''')
+        # Dropping the table also drops its triggers and indexes; they are
+        # recreated by _initialize_database
+        cursor.execute('DROP TABLE memories')
+        cursor.execute('ALTER TABLE memories_migrated RENAME TO memories')
+    
+    def _migrate_compressed_content(self, cursor: sqlite3.Cursor):
+        """Compress stored content, dropping the external-content FTS index (rebuilt contentless)."""
+        logger.info("Migrating memory content to compressed storage")
+        cursor.execute('PRAGMA table_info(memories)')
+        if 'content_len' not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute('ALTER TABLE memories ADD COLUMN content_len INTEGER')
+        # The old external-content index and its triggers read memories.content
+        # directly, so drop them before rewriting it
+        for trigger in ('memories_ai', 'memories_ad', 'memories_au'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        cursor.execute('DROP TABLE IF EXISTS memories_fts')
+        self.conn.create_function('memory_pack', 1, _pack_content)
+        cursor.execute('''
+            UPDATE memories
+            SET content_len = length(CAST(content AS BLOB)), content = memory_pack(content)
+        ''')
+    
+    def _migrate_importance_bucket(self, cursor: sqlite3.Cursor):
+        """Add the importance_bucket generated column to an existing memories table."""
+        # table_info omits generated columns, table_xinfo lists them
+        cursor.execute('PRAGMA table_xinfo(memories)')
+        if 'importance_bucket' not in {row['name'] for row in cursor.fetchall()}:
+            # ALTER TABLE can only add VIRTUAL generated columns; idx_bucket
+            # still stores the computed values
+            cursor.execute(f'ALTER TABLE memories ADD COLUMN {IMPORTANCE_BUCKET_COLUMN}')
+    
+    def _rebuild_fts(self, cursor: sqlite3.Cursor):
+        """Recreate the FTS index from FTS_TABLE_SQL (e.g. after a tokenizer change) and repopulate it."""
+        logger.info("Rebuilding memory full-text index")
+        for trigger in ('memories_ai', 'memories_ad', 'memories_au'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        cursor.execute('DROP TABLE IF EXISTS memories_fts')
+        cursor.execute(FTS_TABLE_SQL)
+        cursor.execute(SQL_INDEX_FTS, (0,))
+    
+    @_serialized
     def store(self, content: str, content_type: str = "general", importance: float = 0.5,
               context: Optional[str] = None, tags: Optional[List[str]] = None) -> Dict[str, Any]:
         """
@@ -128,17 +568,17 @@ class LongTermMemoryTool:
             importance = max(0.0, min(1.0, importance))
             
             # Convert tags to JSON
-            tags_json = json.dumps(tags or [])
+            tags_json = _dumps(tags or [])
+            now = _now_us()
+            content_len = len(content.encode('utf-8'))
             
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT INTO memories (content, content_type, importance, context, tags, created_at, last_accessed)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (content, content_type, importance, context, tags_json, 
-                  datetime.now().isoformat(), datetime.now().isoformat()))
-            
-            memory_id = cursor.lastrowid
+            memory_id = self.conn.execute(
+                SQL_INSERT_MEMORY,
+                (_pack_content(content), content_type, importance, context, tags_json,
+                 now, now, content_len)
+            ).fetchone()[0]
             self.conn.commit()
+            self._active_count += 1
             
             # Check if pruning needed
             self._prune_if_needed()
@@ -157,6 +597,167 @@ class LongTermMemoryTool:
                 "error": str(e)
             }
     
+    @_serialized
+    def store_many(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Store several memories in a single transaction.
+        
+        Args:
+            items: Dicts with the same keys as store() arguments
+                (content is required, the rest use store()'s defaults)
+            
+        Returns:
+            Success status, number of stored memories and their IDs
+        """
+        try:
+            rows = self._memory_rows(items)
+            
+            # executemany() cannot return rows, so insert multi-VALUES
+            # batches that stay under SQLite's bound-parameter limit
+            memory_ids = []
+            with self.conn:
+                for start in range(0, len(rows), STORE_MANY_BATCH_SIZE):
+                    batch = rows[start:start + STORE_MANY_BATCH_SIZE]
+                    values = ", ".join(["(?, ?, ?, ?, ?, ?, ?, ?)"] * len(batch))
+                    cursor = self.conn.execute(
+                        "INSERT INTO memories (content, content_type, importance, context, tags, "
+                        f"created_at, last_accessed, content_len) VALUES {values} RETURNING id",
+                        [value for row in batch for value in row]
+                    )
+                    memory_ids.extend(row[0] for row in cursor.fetchall())
+            self._active_count += len(memory_ids)
+            
+            # Prune once for the whole batch
+            self._prune_if_needed()
+            
+            return {
+                "success": True,
+                "stored": len(rows),
+                "memory_ids": memory_ids
+            }
+            
+        except Exception as e:
+            logger.error(f"Error storing memories: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @_serialized
+    def bulk_load(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Import many memories, indexing them in one pass after the insert.
+        
+        Unlike store_many(), the per-row insert triggers are dropped for the
+        load; the new rows are then added to the tag table and FTS index with
+        one INSERT ... SELECT each and the triggers recreated, all in a single
+        transaction so other connections never see the triggers missing.
+        
+        Args:
+            items: Dicts with the same keys as store() arguments
+            
+        Returns:
+            Success status and number of stored memories
+        """
+        try:
+            rows = self._memory_rows(items)
+            
+            cursor = self.conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                # AUTOINCREMENT ids only grow, so the load is every id above this
+                cursor.execute('SELECT COALESCE(MAX(id), 0) FROM memories')
+                last_id = cursor.fetchone()[0]
+                
+                cursor.execute('DROP TRIGGER IF EXISTS memories_ai')
+                cursor.execute('DROP TRIGGER IF EXISTS memory_tags_ai')
+                cursor.executemany(SQL_BULK_INSERT_MEMORY, rows)
+                cursor.execute(SQL_INDEX_TAGS, (last_id,))
+                cursor.execute(SQL_INDEX_FTS, (last_id,))
+                cursor.execute(TAGS_INSERT_TRIGGER_SQL)
+                cursor.execute(FTS_INSERT_TRIGGER_SQL)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            self._active_count += len(rows)
+            
+            self._prune_if_needed()
+            
+            return {
+                "success": True,
+                "stored": len(rows)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error bulk loading memories: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @staticmethod
+    def _memory_rows(items: List[Dict[str, Any]]) -> List[tuple]:
+        """Build SQL_INSERT_MEMORY parameter tuples for a batch, sharing one timestamp."""
+        now = _now_us()
+        return [
+            (_pack_content(item['content']), item.get('content_type', 'general'),
+             max(0.0, min(1.0, item.get('importance', 0.5))),
+             item.get('context'), _dumps(item.get('tags') or []), now, now,
+             len(item['content'].encode('utf-8')))
+            for item in items
+        ]
+    
+    @staticmethod
+    def _row_to_memory(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a memories row to the response dict (decoded tags, ISO timestamps)."""
+        memory = dict(row)
+        # Storage-only columns stay out of the public memory dict
+        memory.pop('importance_bucket', None)
+        memory.pop('content_len', None)
+        memory['content'] = _unpack_content(memory['content'])
+        memory['tags'] = _loads(memory['tags']) if memory['tags'] else []
+        memory['created_at'] = _us_to_iso(memory['created_at'])
+        memory['last_accessed'] = _us_to_iso(memory['last_accessed'])
+        return memory
+    
+    @contextmanager
+    def _reader(self):
+        """Borrow a read connection from the pool, or use the writer without one."""
+        if self._read_pool is None:
+            with self._write_lock:
+                yield self.conn
+        else:
+            with self._read_pool.connection() as conn:
+                yield conn
+    
+    def _iter_memories(self, page: Callable[[Optional[tuple], int], Tuple[str, List[Any]]],
+                       sort_key: Callable[[sqlite3.Row], tuple],
+                       limit: int) -> Iterator[Dict[str, Any]]:
+        """
+        Yield converted rows of a memories query, fetched in batches.
+        
+        Each batch is read and the connection released before it is yielded,
+        so a paused generator holds neither a pooled connection nor the write
+        lock. ``page(after, size)`` returns the SQL and parameters for the
+        ``size`` rows following sort key ``after`` (None for the first batch);
+        ``sort_key`` gives a row's key. A negative limit means no limit.
+        """
+        remaining = limit if limit >= 0 else float('inf')
+        after = None
+        while remaining > 0:
+            size = int(min(remaining, FETCH_BATCH_SIZE))
+            sql, params = page(after, size)
+            with self._reader() as conn:
+                rows = conn.execute(sql, params).fetchall()
+            
+            for row in rows:
+                yield self._row_to_memory(row)
+            if len(rows) < size:
+                return
+            remaining -= size
+            after = sort_key(rows[-1])
+    
     def retrieve(self, memory_id: int) -> Dict[str, Any]:
         """
         Retrieve a specific memory by ID.
@@ -168,33 +769,44 @@ class LongTermMemoryTool:
             Memory data
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT * FROM memories WHERE id = ?
-            ''', (memory_id,))
-            
-            row = cursor.fetchone()
-            
-            if not row:
-                return {
-                    "success": False,
-                    "error": f"Memory {memory_id} not found"
-                }
+            with self._write_lock:
+                cached = self._retrieve_cache.get(memory_id)
+                if cached is not None and time.monotonic() - cached[0] < RETRIEVE_CACHE_TTL:
+                    self._retrieve_cache.move_to_end(memory_id)
+                    memory = cached[1]
+                else:
+                    memory = None
             
-            # Update access tracking
-            cursor.execute('''
-                UPDATE memories 
-                SET last_accessed = ?, access_count = access_count + 1
-                WHERE id = ?
-            ''', (datetime.now().isoformat(), memory_id))
-            self.conn.commit()
+            if memory is None:
+                with self._reader() as conn:
+                    row = conn.execute(SQL_SELECT_MEMORY, (memory_id,)).fetchone()
+                
+                if not row:
+                    return {
+                        "success": False,
+                        "error": f"Memory {memory_id} not found"
+                    }
+                
+                memory = self._row_to_memory(row)
+                with self._write_lock:
+                    self._retrieve_cache[memory_id] = (time.monotonic(), memory)
+                    self._retrieve_cache.move_to_end(memory_id)
+                    if len(self._retrieve_cache) > RETRIEVE_CACHE_SIZE:
+                        self._retrieve_cache.popitem(last=False)
             
-            memory = dict(row)
-            memory['tags'] = json.loads(memory['tags']) if memory['tags'] else []
+            # Buffer access tracking; written back in batches by _flush_access
+            with self._write_lock:
+                entry = self._access_buf.setdefault(memory_id, [0, 0])
+                entry[0] += 1
+                entry[1] = _now_us()
+                self._pending_reads += 1
+                if self._pending_reads >= ACCESS_FLUSH_INTERVAL:
+                    self._flush_access()
             
+            # Copy so callers cannot modify the cached entry
             return {
                 "success": True,
-                "memory": memory
+                "memory": {**memory, 'tags': list(memory['tags'])}
             }
             
         except Exception as e:
@@ -221,39 +833,7 @@ class LongTermMemoryTool:
             Matching memories
         """
         try:
-            cursor = self.conn.cursor()
-            
-            # Build query
-            sql = '''
-                SELECT m.*, rank
-                FROM memories m
-                JOIN memories_fts ON m.id = memories_fts.rowid
-                WHERE memories_fts MATCH ?
-                AND m.importance >= ?
-            '''
-            params = [query, min_importance]
-            
-            if content_type:
-                sql += ' AND m.content_type = ?'
-                params.append(content_type)
-            
-            if tags:
-                # Check if any tag matches
-                tag_conditions = ' OR '.join(['m.tags LIKE ?' for _ in tags])
-                sql += f' AND ({tag_conditions})'
-                params.extend([f'%{tag}%' for tag in tags])
-            
-            sql += ' ORDER BY rank, m.importance DESC, m.last_accessed DESC LIMIT ?'
-            params.append(limit)
-            
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
-            
-            memories = []
-            for row in rows:
-                memory = dict(row)
-                memory['tags'] = json.loads(memory['tags']) if memory['tags'] else []
-                memories.append(memory)
+            memories = list(self.iter_search(query, content_type, min_importance, tags, limit))
             
             return {
                 "success": True,
@@ -269,6 +849,37 @@ class LongTermMemoryTool:
                 "error": str(e)
             }
     
+    def iter_search(self, query: str, content_type: Optional[str] = None,
+                    min_importance: float = 0.0, tags: Optional[List[str]] = None,
+                    limit: int = 10) -> Iterator[Dict[str, Any]]:
+        """
+        Stream full-text search results one memory at a time.
+        
+        Takes the same arguments as search(); errors are raised rather than
+        returned as a status dict.
+        
+        Yields:
+            Matching memories, best rank first
+        """
+        # Overfetch FTS matches when the filters may drop rows
+        has_filters = min_importance > 0.0 or content_type or tags
+        fts_limit = max(limit * 10, 100) if has_filters else limit
+        
+        params = [query, fts_limit, min_importance]
+        if content_type:
+            params.append(content_type)
+        if tags:
+            params.extend(tags)
+        
+        def page(after, size):
+            sql = _compile_search_sql(bool(content_type), len(tags or ()), after is not None)
+            return sql, params + list(after or ()) + [size]
+        
+        def sort_key(row):
+            return (row['rank'], -row['importance'], -row['last_accessed'], row['id'])
+        
+        yield from self._iter_memories(page, sort_key, limit)
+    
     def get_by_tags(self, tags: List[str], match_all: bool = False, limit: int = 50) -> Dict[str, Any]:
         """
         Retrieve memories by tags.
@@ -282,37 +893,7 @@ class LongTermMemoryTool:
             Matching memories
         """
         try:
-            cursor = self.conn.cursor()
-            
-            if match_all:
-                # All tags must match
-                conditions = ' AND '.join(['tags LIKE ?' for _ in tags])
-                sql = f'''
-                    SELECT * FROM memories 
-                    WHERE {conditions}
-                    ORDER BY importance DESC, last_accessed DESC
-                    LIMIT ?
-                '''
-                params = [f'%{tag}%' for tag in tags] + [limit]
-            else:
-                # Any tag matches
-                conditions = ' OR '.join(['tags LIKE ?' for _ in tags])
-                sql = f'''
-                    SELECT * FROM memories 
-                    WHERE {conditions}
-                    ORDER BY importance DESC, last_accessed DESC
-                    LIMIT ?
-                '''
-                params = [f'%{tag}%' for tag in tags] + [limit]
-            
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
-            
-            memories = []
-            for row in rows:
-                memory = dict(row)
-                memory['tags'] = json.loads(memory['tags']) if memory['tags'] else []
-                memories.append(memory)
+            memories = list(self.iter_by_tags(tags, match_all, limit))
             
             return {
                 "success": True,
@@ -329,6 +910,31 @@ class LongTermMemoryTool:
                 "error": str(e)
             }
     
+    def iter_by_tags(self, tags: List[str], match_all: bool = False,
+                     limit: int = 50) -> Iterator[Dict[str, Any]]:
+        """
+        Stream memories by tags one at a time.
+        
+        Takes the same arguments as get_by_tags(); errors are raised rather
+        than returned as a status dict.
+        
+        Yields:
+            Matching memories, most important first
+        """
+        unique_tags = list(dict.fromkeys(tags))
+        
+        def page(after, size):
+            params = unique_tags + list(after or ())
+            if match_all:
+                params.append(len(unique_tags))
+            params.append(size)
+            return _compile_tags_sql(len(unique_tags), match_all, after is not None), params
+        
+        def sort_key(row):
+            return (row['importance'], row['last_accessed'], row['id'])
+        
+        yield from self._iter_memories(page, sort_key, limit)
+    
     def get_recent(self, days: int = 7, content_type: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
         """
         Get recent memories.
@@ -342,30 +948,7 @@ class LongTermMemoryTool:
             Recent memories
         """
         try:
-            cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-            
-            cursor = self.conn.cursor()
-            sql = '''
-                SELECT * FROM memories 
-                WHERE created_at >= ?
-            '''
-            params = [cutoff]
-            
-            if content_type:
-                sql += ' AND content_type = ?'
-                params.append(content_type)
-            
-            sql += ' ORDER BY created_at DESC LIMIT ?'
-            params.append(limit)
-            
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
-            
-            memories = []
-            for row in rows:
-                memory = dict(row)
-                memory['tags'] = json.loads(memory['tags']) if memory['tags'] else []
-                memories.append(memory)
+            memories = list(self.iter_recent(days, content_type, limit))
             
             return {
                 "success": True,
@@ -381,6 +964,41 @@ class LongTermMemoryTool:
                 "error": str(e)
             }
     
+    def iter_recent(self, days: int = 7, content_type: Optional[str] = None,
+                    limit: int = 50) -> Iterator[Dict[str, Any]]:
+        """
+        Stream recent memories one at a time.
+        
+        Takes the same arguments as get_recent(); errors are raised rather
+        than returned as a status dict.
+        
+        Yields:
+            Recent memories, newest first
+        """
+        cutoff = _now_us() - days * US_PER_DAY
+        
+        sql = '''
+            SELECT * FROM memories 
+            WHERE created_at >= ?
+        '''
+        params = [cutoff]
+        
+        if content_type:
+            sql += ' AND content_type = ?'
+            params.append(content_type)
+        
+        def page(after, size):
+            if after is None:
+                return sql + ' ORDER BY created_at DESC, id DESC LIMIT ?', params + [size]
+            return (sql + ' AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT ?',
+                    params + list(after) + [size])
+        
+        def sort_key(row):
+            return (row['created_at'], row['id'])
+        
+        yield from self._iter_memories(page, sort_key, limit)
+    
+    @_serialized
     def update_importance(self, memory_id: int, importance: float) -> Dict[str, Any]:
         """
         Update memory importance score.
@@ -407,6 +1025,7 @@ class LongTermMemoryTool:
                 }
             
             self.conn.commit()
+            self._retrieve_cache.pop(memory_id, None)
             
             return {
                 "success": True,
@@ -421,6 +1040,7 @@ class LongTermMemoryTool:
                 "error": str(e)
             }
     
+    @_serialized
     def delete(self, memory_id: int) -> Dict[str, Any]:
         """
         Delete a memory.
@@ -433,15 +1053,19 @@ class LongTermMemoryTool:
         """
         try:
             cursor = self.conn.cursor()
-            cursor.execute('DELETE FROM memories WHERE id = ?', (memory_id,))
+            cursor.execute('DELETE FROM memories WHERE id = ? RETURNING archived', (memory_id,))
+            row = cursor.fetchone()
             
-            if cursor.rowcount == 0:
+            if row is None:
                 return {
                     "success": False,
                     "error": f"Memory {memory_id} not found"
                 }
             
             self.conn.commit()
+            self._retrieve_cache.pop(memory_id, None)
+            if not row['archived']:
+                self._active_count -= 1
             
             return {
                 "success": True,
@@ -455,30 +1079,56 @@ class LongTermMemoryTool:
                 "error": str(e)
             }
     
+    @_serialized
+    def _flush_access(self):
+        """Write buffered access counts and times in a single transaction."""
+        if not self._access_buf:
+            return
+        rows = [(count, accessed, memory_id)
+                for memory_id, (count, accessed) in self._access_buf.items()]
+        with self.conn:
+            self.conn.executemany(SQL_UPDATE_ACCESS, rows)
+        self._access_buf.clear()
+        self._pending_reads = 0
+    
+    @_serialized
     def _prune_if_needed(self):
-        """Prune old/low-importance memories if limit exceeded."""
+        """Prune old/low-importance memories once the limit plus slack is exceeded."""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT COUNT(*) as count FROM memories WHERE archived = 0')
-            count = cursor.fetchone()['count']
-            
-            if count > self.max_entries:
-                # Calculate how many to remove
-                to_remove = count - self.max_entries
+            if self._active_count > self.max_entries + self.prune_slack:
+                # Pruning orders by access data, so apply pending accesses first
+                self._flush_access()
                 
-                # Remove lowest importance, least accessed memories
-                cursor.execute('''
-                    DELETE FROM memories 
-                    WHERE id IN (
-                        SELECT id FROM memories 
+                # Trim below the limit so the next prune is prune_slack inserts away
+                to_remove = self._active_count - (self.max_entries - self.prune_slack)
+                
+                cursor = self.conn.cursor()
+                cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    # Pick the lowest importance, least accessed memories once;
+                    # idx_prune yields them in order without sorting
+                    cursor.execute('CREATE TEMP TABLE IF NOT EXISTS prune_ids (id INTEGER PRIMARY KEY)')
+                    cursor.execute('DELETE FROM temp.prune_ids')
+                    cursor.execute('''
+                        INSERT INTO temp.prune_ids (id)
+                        SELECT id FROM memories
                         WHERE archived = 0
                         ORDER BY importance ASC, access_count ASC, last_accessed ASC
                         LIMIT ?
-                    )
-                ''', (to_remove,))
+                    ''', (to_remove,))
+                    
+                    # Clear tags up front so the per-row memory_tags_ad trigger has nothing to do
+                    cursor.execute('DELETE FROM memory_tags WHERE memory_id IN (SELECT id FROM temp.prune_ids)')
+                    cursor.execute('DELETE FROM memories WHERE id IN (SELECT id FROM temp.prune_ids)')
+                    removed = cursor.rowcount
+                    self.conn.commit()
+                except Exception:
+                    self.conn.rollback()
+                    raise
                 
-                self.conn.commit()
-                logger.info(f"Pruned {to_remove} memories")
+                self._active_count -= removed
+                self._retrieve_cache.clear()
+                logger.info(f"Pruned {removed} memories")
                 
         except Exception as e:
             logger.error(f"Error pruning memories: {e}")
@@ -491,44 +1141,47 @@ class LongTermMemoryTool:
             Storage statistics
         """
         try:
-            cursor = self.conn.cursor()
-            
-            # Total count
-            cursor.execute('SELECT COUNT(*) as count FROM memories')
-            total_count = cursor.fetchone()['count']
-            
-            # By content type
-            cursor.execute('''
-                SELECT content_type, COUNT(*) as count 
-                FROM memories 
-                GROUP BY content_type
-            ''')
-            by_type = {row['content_type']: row['count'] for row in cursor.fetchall()}
-            
-            # Importance distribution
-            cursor.execute('''
-                SELECT 
-                    CASE 
-                        WHEN importance >= 0.8 THEN 'high'
-                        WHEN importance >= 0.5 THEN 'medium'
-                        ELSE 'low'
-                    END as category,
-                    COUNT(*) as count
-                FROM memories
-                GROUP BY category
-            ''')
-            by_importance = {row['category']: row['count'] for row in cursor.fetchall()}
-            
-            # Recent activity
-            cutoff = (datetime.now() - timedelta(days=7)).isoformat()
-            cursor.execute('SELECT COUNT(*) as count FROM memories WHERE created_at >= ?', (cutoff,))
-            recent_count = cursor.fetchone()['count']
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                
+                # Total count
+                cursor.execute('''
+                    SELECT COUNT(*) as count, COALESCE(SUM(content_len), 0) as content_bytes
+                    FROM memories
+                ''')
+                row = cursor.fetchone()
+                total_count = row['count']
+                content_bytes = row['content_bytes']
+                
+                # By content type
+                cursor.execute('''
+                    SELECT content_type, COUNT(*) as count 
+                    FROM memories 
+                    GROUP BY content_type
+                ''')
+                by_type = {row['content_type']: row['count'] for row in cursor.fetchall()}
+                
+                # Importance distribution (covered by idx_bucket)
+                cursor.execute('''
+                    SELECT importance_bucket, COUNT(*) as count
+                    FROM memories
+                    GROUP BY importance_bucket
+                ''')
+                by_importance = {
+                    IMPORTANCE_BUCKETS[row['importance_bucket']]: row['count'] for row in cursor.fetchall()
+                }
+                
+                # Recent activity
+                cutoff = _now_us() - 7 * US_PER_DAY
+                cursor.execute('SELECT COUNT(*) as count FROM memories WHERE created_at >= ?', (cutoff,))
+                recent_count = cursor.fetchone()['count']
             
             return {
                 "success": True,
                 "total_memories": total_count,
                 "max_entries": self.max_entries,
                 "usage_percent": (total_count / self.max_entries) * 100,
+                "content_bytes": content_bytes,
                 "by_content_type": by_type,
                 "by_importance": by_importance,
                 "recent_7days": recent_count
@@ -541,9 +1194,16 @@ class LongTermMemoryTool:
                 "error": str(e)
             }
     
+    @_serialized
     def close(self):
-        """Close database connection."""
+        """Flush buffered accesses and close database connections."""
+        if self._read_pool is not None:
+            self._read_pool.close()
         if self.conn:
+            try:
+                self._flush_access()
+            except Exception as e:
+                logger.error(f"Error flushing memory accesses: {e}")
             self.conn.close()
             logger.info("Database connection closed")
 
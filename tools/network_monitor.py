@@ -3,14 +3,223 @@ Network Monitor Tool (OpenAI-Compatible)
 Monitors network connectivity, latency, and performs basic network diagnostics.
 """
 
+import errno
+import ipaddress
+import math
+import selectors
+import shutil
 import subprocess
 import socket
 import time
 import platform
 import re
-from typing import Dict, List, Any, Optional
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime
-import statistics
+
+try:
+    from icmplib import ping as _icmp_ping
+    from icmplib import SocketPermissionError
+except ImportError:
+    _icmp_ping = None
+
+try:
+    import resource
+except ImportError:
+    # Windows has no rlimits
+    resource = None
+
+try:
+    from . import _uring_scan
+except ImportError:
+    try:
+        import _uring_scan
+    except ImportError:
+        _uring_scan = None
+
+# Connects in flight (sockets open at once) during scan_ports where the
+# open-file limit cannot be read; kept well under the common 1024 default
+SCAN_CONCURRENCY = 512
+# Descriptors left free for the rest of the process when sizing scan batches
+SCAN_FD_RESERVE = 64
+# io_uring rings top out at 32768 entries and each port takes two
+SCAN_MAX_BATCH = 16384
+# Per-port connect timeout for scan_ports, in seconds
+SCAN_TIMEOUT = 2
+
+# Linux applies SO_SNDTIMEO to blocking connect(), so check_port can let the
+# kernel enforce its timeout instead of Python's settimeout machinery
+_KERNEL_CONNECT_TIMEOUT = platform.system() == "Linux"
+
+# epoll on Linux; each socket is unregistered on its first event, so level
+# triggering never wakes the scan twice for one port
+_Selector = selectors.EpollSelector if platform.system() == "Linux" else selectors.DefaultSelector
+
+# connect() results meaning "in progress" on a non-blocking socket
+_CONNECT_PENDING = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN,
+                    getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK)}
+
+# SO_LINGER {on, 0s}: close() sends RST instead of FIN, so probe sockets do
+# not sit in TIME_WAIT holding ephemeral ports (Windows uses u_short fields)
+LINGER_RESET = struct.pack('HH' if platform.system() == "Windows" else 'ii', 1, 0)
+
+# ping output parsers, compiled once (output is ASCII, so skip Unicode classes)
+_PING_WIN_LOSS = re.compile(r'(\d+)% loss', re.ASCII)
+_PING_WIN_TIME = re.compile(r'time[=<](\d+)ms', re.ASCII)
+_PING_NIX_LOSS = re.compile(r'(\d+)% packet loss', re.ASCII)
+_PING_NIX_TIME = re.compile(r'time=(\d+\.?\d*) ms', re.ASCII)
+
+# Forward and reverse DNS results are reused for DNS_CACHE_TTL seconds; the
+# cache holds at most DNS_CACHE_SIZE entries, evicting the least recently used
+DNS_CACHE_TTL = 300
+DNS_CACHE_SIZE = 256
+# Resolver threads used by warm_dns_cache
+DNS_WARM_WORKERS = 32
+# Keyed by hostname, or by ("PTR", address) for reverse lookups
+_DNS_CACHE: "OrderedDict[Any, tuple]" = OrderedDict()
+_DNS_LOCK = threading.Lock()
+
+# Display names for well-known ports; others fall back to the services database
+_SERVICES = {
+    21: "FTP",
+    22: "SSH",
+    23: "Telnet",
+    25: "SMTP",
+    53: "DNS",
+    80: "HTTP",
+    110: "POP3",
+    143: "IMAP",
+    443: "HTTPS",
+    445: "SMB",
+    3306: "MySQL",
+    3389: "RDP",
+    5432: "PostgreSQL",
+    5900: "VNC",
+    8080: "HTTP-Alt"
+}
+
+
+def _is_ip_literal(host: str) -> Optional[int]:
+    """Return the IP version (4 or 6) when host is an address literal, else None."""
+    try:
+        return ipaddress.ip_address(host).version
+    except ValueError:
+        return None
+
+
+def _dns_cached(key: Any, resolve: Callable[[], Any], ttl: float) -> tuple:
+    """Return (value, from_cache) for key, calling resolve() on a miss or expiry."""
+    now = time.monotonic()
+    with _DNS_LOCK:
+        entry = _DNS_CACHE.get(key)
+        if entry is not None and now < entry[0]:
+            _DNS_CACHE.move_to_end(key)
+            return entry[1], True
+    
+    value = resolve()
+    with _DNS_LOCK:
+        _DNS_CACHE[key] = (now + ttl, value)
+        _DNS_CACHE.move_to_end(key)
+        while len(_DNS_CACHE) > DNS_CACHE_SIZE:
+            _DNS_CACHE.popitem(last=False)
+    return value, False
+
+
+def _getaddrinfo(host: str) -> tuple:
+    """Uncached forward lookup behind _dns_resolve."""
+    infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM, flags=socket.AI_CANONNAME)
+    # dict keys dedupe while keeping the resolver's order
+    ipv4 = {info[4][0]: None for info in infos if info[0] == socket.AF_INET}
+    ipv6 = {info[4][0]: None for info in infos if info[0] == socket.AF_INET6}
+    return infos[0][3] or host, [], list(ipv4), list(ipv6)
+
+
+def _dns_resolve_ex(host: str, ttl: float = DNS_CACHE_TTL) -> tuple:
+    """
+    Resolve a hostname to ((canonical_name, aliases, ipv4_addresses,
+    ipv6_addresses), from_cache).
+    
+    One getaddrinfo call returns both A and AAAA records. IP literals are
+    returned as-is (from_cache True) without touching the resolver. Raises
+    socket.gaierror when the name cannot be resolved; failures are not
+    cached.
+    """
+    version = _is_ip_literal(host)
+    if version == 4:
+        return (host, [], [host], []), True
+    if version == 6:
+        return (host, [], [], [host]), True
+    return _dns_cached(host, lambda: _getaddrinfo(host), ttl)
+
+
+def _dns_resolve(host: str, ttl: float = DNS_CACHE_TTL) -> tuple:
+    """Resolve a hostname to (canonical_name, aliases, ipv4_addresses, ipv6_addresses), cached."""
+    return _dns_resolve_ex(host, ttl)[0]
+
+
+def _reverse_resolve(address: str, ttl: float = DNS_CACHE_TTL) -> tuple:
+    """Return (PTR hostname or None, from_cache) for an address; misses are cached too."""
+    def lookup():
+        try:
+            return socket.gethostbyaddr(address)[0]
+        except (socket.herror, socket.gaierror):
+            return None
+    return _dns_cached(("PTR", address), lookup, ttl)
+
+
+def _resolve_ipv4(host: str) -> str:
+    """First IPv4 address of host, for the AF_INET probes; socket.gaierror if none."""
+    addresses = _dns_resolve(host)[2]
+    if not addresses:
+        raise socket.gaierror(socket.EAI_NONAME, "No IPv4 address for host")
+    return addresses[0]
+
+
+@lru_cache(maxsize=4096)
+def _get_service_name(port: int) -> str:
+    """Get common service name for a port, falling back to the services database."""
+    service = _SERVICES.get(port)
+    if service is not None:
+        return service
+    try:
+        return socket.getservbyport(port, "tcp")
+    except (OSError, OverflowError):
+        return "Unknown"
+
+
+def _scan_batch_size(port_count: int) -> int:
+    """
+    Number of ports to probe at once, raising the soft RLIMIT_NOFILE so a
+    whole scan fits in one batch where the hard limit allows.
+    """
+    if resource is None:
+        return SCAN_CONCURRENCY
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = port_count + SCAN_FD_RESERVE
+    if wanted > soft:
+        limit = wanted if hard == resource.RLIM_INFINITY else min(hard, wanted)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+            soft = limit
+        except (ValueError, OSError):
+            pass
+    # Never exceed the soft limit, even when it stays below SCAN_CONCURRENCY
+    return max(1, min(port_count, soft - SCAN_FD_RESERVE, SCAN_MAX_BATCH))
+
+
+def invalidate_dns(host: Optional[str] = None):
+    """Drop a cached DNS entry, or the whole cache when host is None."""
+    with _DNS_LOCK:
+        if host is None:
+            _DNS_CACHE.clear()
+        else:
+            _DNS_CACHE.pop(host, None)
+
+
 
 class NetworkMonitorTool:
     """
@@ -22,6 +231,17 @@ class NetworkMonitorTool:
         """Initialize network monitor."""
         self.system = platform.system()
         
+        # OS-specific ping argv template and output parsers, chosen once
+        if self.system == "Windows":
+            self._ping_argv_fmt = ("ping", "-n", "{count}", "-w", "{tms}", "{host}")
+            self._ping_loss_re, self._ping_time_re = _PING_WIN_LOSS, _PING_WIN_TIME
+        else:
+            self._ping_argv_fmt = ("ping", "-c", "{count}", "-W", "{t}", "{host}")
+            self._ping_loss_re, self._ping_time_re = _PING_NIX_LOSS, _PING_NIX_TIME
+        
+        # fping probes any number of hosts from one process
+        self._fping = shutil.which("fping") if self.system != "Windows" else None
+        
     def ping_host(self, host: str, count: int = 4, timeout: int = 5) -> Dict[str, Any]:
         """
         Ping a host to check connectivity and measure latency.
@@ -35,62 +255,92 @@ class NetworkMonitorTool:
             Dictionary with ping results
         """
         try:
-            # Construct ping command based on OS
-            if self.system == "Windows":
-                cmd = ["ping", "-n", str(count), "-w", str(timeout * 1000), host]
-            else:
-                cmd = ["ping", "-c", str(count), "-W", str(timeout), host]
-            
-            # Execute ping
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout * count + 5
-            )
-            
-            # Parse output
-            output = result.stdout
-            
-            # Extract statistics
-            if self.system == "Windows":
-                packet_loss_match = re.search(r'(\d+)% loss', output)
-                time_matches = re.findall(r'time[=<](\d+)ms', output)
-            else:
-                packet_loss_match = re.search(r'(\d+)% packet loss', output)
-                time_matches = re.findall(r'time=(\d+\.?\d*) ms', output)
+            # Resolve through the cache so ping does not repeat the lookup
+            address = _resolve_ipv4(host)
+            
+            # Prefer ICMP sockets via icmplib, then fping, then the ping binary
+            measured = self._ping_icmp(address, count, timeout) if _icmp_ping is not None else None
+            if measured is None and self._fping:
+                measured = (self._ping_fping([address], count, timeout) or {}).get(address)
+            if measured is None:
+                measured = self._ping_subprocess(address, count, timeout)
+            latencies, packet_loss = measured
             
-            packet_loss = int(packet_loss_match.group(1)) if packet_loss_match else 100
-            latencies = [float(t) for t in time_matches] if time_matches else []
+            return self._ping_result(host, count, latencies, packet_loss)
             
-            success = packet_loss < 100 and len(latencies) > 0
+        except subprocess.TimeoutExpired:
+            return {
+                "success": False,
+                "error": "Ping command timed out",
+                "host": host
+            }
+        except socket.gaierror:
+            return {
+                "success": False,
+                "error": "Hostname could not be resolved",
+                "host": host
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "error_type": type(e).__name__
+            }
+    
+    def ping_hosts(self, hosts: List[str], count: int = 4, timeout: int = 5) -> Dict[str, Any]:
+        """
+        Ping several hosts at once.
+        
+        With fping installed every host is probed by a single fping process;
+        otherwise the hosts are pinged concurrently with ping_host.
+        
+        Args:
+            hosts: Hostnames or IP addresses
+            count: Number of ping requests per host
+            timeout: Timeout in seconds
             
-            stats = {}
-            if latencies:
-                stats = {
-                    "min_ms": round(min(latencies), 2),
-                    "max_ms": round(max(latencies), 2),
-                    "avg_ms": round(statistics.mean(latencies), 2),
-                    "median_ms": round(statistics.median(latencies), 2),
-                    "jitter_ms": round(statistics.stdev(latencies), 2) if len(latencies) > 1 else 0
-                }
+        Returns:
+            Dictionary with a ping_host-style result per host
+        """
+        try:
+            results = {}
+            addresses = {}
+            for host in hosts:
+                try:
+                    addresses[host] = _resolve_ipv4(host)
+                except socket.gaierror:
+                    results[host] = {
+                        "success": False,
+                        "error": "Hostname could not be resolved",
+                        "host": host
+                    }
+            
+            measured = None
+            if self._fping and addresses:
+                measured = self._ping_fping(list(set(addresses.values())), count, timeout)
+            
+            if measured is not None:
+                for host, address in addresses.items():
+                    latencies, packet_loss = measured.get(address, ([], 100))
+                    results[host] = self._ping_result(host, count, list(latencies), packet_loss)
+            elif addresses:
+                with ThreadPoolExecutor(max_workers=min(len(addresses), 32)) as executor:
+                    futures = {host: executor.submit(self.ping_host, host, count, timeout)
+                               for host in addresses}
+                results.update((host, future.result()) for host, future in futures.items())
             
             return {
-                "success": success,
-                "host": host,
-                "packets_sent": count,
-                "packets_received": len(latencies),
-                "packet_loss_percent": packet_loss,
-                "latencies": latencies,
-                "statistics": stats,
+                "success": True,
+                "hosts_pinged": len(hosts),
+                "hosts_reachable": sum(1 for r in results.values() if r["success"]),
+                "results": {host: results[host] for host in hosts},
                 "timestamp": datetime.now().isoformat()
             }
             
         except subprocess.TimeoutExpired:
             return {
                 "success": False,
-                "error": "Ping command timed out",
-                "host": host
+                "error": "Ping command timed out"
             }
         except Exception as e:
             return {
@@ -99,7 +349,123 @@ class NetworkMonitorTool:
                 "error_type": type(e).__name__
             }
     
-    def check_port(self, host: str, port: int, timeout: int = 5) -> Dict[str, Any]:
+    def _ping_result(self, host: str, count: int, latencies: List[float],
+                     packet_loss: int) -> Dict[str, Any]:
+        """Build a ping_host result from the measured round-trip times."""
+        success = packet_loss < 100 and len(latencies) > 0
+        
+        stats = {}
+        if latencies:
+            # One sort gives min/max/median; sum and sum of squares give
+            # mean and sample stdev without a second pass over deviations
+            ordered = sorted(latencies)
+            n = len(ordered)
+            mid = n // 2
+            total = sum(ordered)
+            mean = total / n
+            median = ordered[mid] if n % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+            jitter = 0
+            if n > 1:
+                variance = (sum(x * x for x in ordered) - total * mean) / (n - 1)
+                jitter = round(math.sqrt(max(variance, 0.0)), 2)
+            stats = {
+                "min_ms": round(ordered[0], 2),
+                "max_ms": round(ordered[-1], 2),
+                "avg_ms": round(mean, 2),
+                "median_ms": round(median, 2),
+                "jitter_ms": jitter
+            }
+        
+        return {
+            "success": success,
+            "host": host,
+            "packets_sent": count,
+            "packets_received": len(latencies),
+            "packet_loss_percent": packet_loss,
+            "latencies": latencies,
+            "statistics": stats,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _ping_icmp(self, address: str, count: int, timeout: int) -> Optional[tuple]:
+        """Ping with unprivileged ICMP sockets; None when the kernel does not allow them."""
+        try:
+            host_obj = _icmp_ping(address, count=count, timeout=timeout, privileged=False)
+        except SocketPermissionError:
+            # net.ipv4.ping_group_range excludes this user
+            return None
+        return list(host_obj.rtts), round(host_obj.packet_loss * 100)
+    
+    def _ping_fping(self, addresses: List[str], count: int, timeout: int) -> Optional[Dict[str, tuple]]:
+        """
+        Ping addresses with one fping process.
+        
+        Returns:
+            address -> (latencies, packet_loss_percent), or None when fping
+            could not run (e.g. it lacks the privileges for raw sockets)
+        """
+        # -C prints every round-trip time per host ("-" for a lost reply)
+        cmd = [self._fping, "-q", "-C", str(count), "-t", str(timeout * 1000), *addresses]
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=timeout * count + 5
+        )
+        # Exit status 0: all replied, 1: some unreachable, 2: unknown host
+        if result.returncode > 2:
+            return None
+        
+        measured = {}
+        for line in result.stderr.splitlines():
+            address, sep, samples = line.partition(" : ")
+            if not sep:
+                continue
+            latencies = [float(t) for t in samples.split() if t != "-"]
+            measured[address.strip()] = (latencies, round((count - len(latencies)) * 100 / count))
+        return measured
+    
+    def _ping_subprocess(self, address: str, count: int, timeout: int) -> tuple:
+        """Ping with the system ping binary, parsing latencies and loss from its output."""
+        cmd = [arg.format(count=count, t=timeout, tms=timeout * 1000, host=address)
+               for arg in self._ping_argv_fmt]
+        
+        limit = timeout * count + 5
+        timed_out = threading.Event()
+        
+        def kill():
+            timed_out.set()
+            proc.kill()
+        
+        # Parse replies line by line as ping prints them instead of
+        # buffering the whole output; stop at the loss summary
+        latencies = []
+        packet_loss = None
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              text=True, bufsize=1) as proc:
+            timer = threading.Timer(limit, kill)
+            timer.start()
+            try:
+                for line in proc.stdout:
+                    match = self._ping_time_re.search(line)
+                    if match:
+                        latencies.append(float(match.group(1)))
+                        continue
+                    match = self._ping_loss_re.search(line)
+                    if match:
+                        packet_loss = int(match.group(1))
+                        break
+            finally:
+                timer.cancel()
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, limit)
+        if packet_loss is None:
+            packet_loss = round((count - min(len(latencies), count)) * 100 / count)
+        return latencies, packet_loss
+    
+    def check_port(self, host: str, port: int, timeout: int = 5,
+                   ip: Optional[str] = None, include_timestamp: bool = True) -> Dict[str, Any]:
         """
         Check if a port is open on a host.
         
@@ -107,35 +473,51 @@ class NetworkMonitorTool:
             host: Hostname or IP address
             port: Port number to check
             timeout: Connection timeout in seconds
+            ip: Already resolved address of host; skips the DNS lookup
+            include_timestamp: Add a "timestamp" field; callers that aggregate
+                results stamp their own output instead
             
         Returns:
             Dictionary with port status
         """
         try:
+            address = ip or _resolve_ipv4(host)
+            
             start_time = time.time()
             
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if _KERNEL_CONNECT_TIMEOUT and timeout > 0:
+                # struct timeval; a timed-out connect returns EINPROGRESS. An
+                # all-zero timeval means no timeout, so round up to 1 us
+                seconds, micros = int(timeout), int(timeout % 1 * 1_000_000)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO,
+                                struct.pack('ll', seconds, micros if seconds else max(1, micros)))
+            else:
+                sock.settimeout(timeout)
             
             try:
-                result = sock.connect_ex((host, port))
+                result = sock.connect_ex((address, port))
                 
                 end_time = time.time()
                 connection_time = round((end_time - start_time) * 1000, 2)
             finally:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RESET)
                 sock.close()
             
             is_open = result == 0
             
-            return {
+            port_result = {
                 "success": True,
                 "host": host,
                 "port": port,
                 "is_open": is_open,
                 "status": "open" if is_open else "closed",
-                "connection_time_ms": connection_time if is_open else None,
-                "timestamp": datetime.now().isoformat()
+                "connection_time_ms": connection_time if is_open else None
             }
+            if include_timestamp:
+                port_result["timestamp"] = datetime.now().isoformat()
+            return port_result
             
         except socket.gaierror:
             return {
@@ -174,20 +556,30 @@ class NetworkMonitorTool:
                     # Well-known ports (1-1024)
                     ports = list(range(1, 1025))
             
-            open_ports = []
-            closed_ports = []
-            
             start_time = time.time()
             
-            for port in ports:
-                result = self.check_port(host, port, timeout=2)
-                
-                if result["success"] and result["is_open"]:
+            # Resolve once so the per-port connects skip DNS
+            address = _resolve_ipv4(host)
+            batch_size = _scan_batch_size(len(ports))
+            
+            if _uring_scan is not None and _uring_scan.available():
+                # Linux 6.0+: submit each batch of connects with one io_uring_enter
+                results = _uring_scan.scan(address, ports, SCAN_TIMEOUT, batch_size)
+            else:
+                results = self._scan_ports_select(address, ports, SCAN_TIMEOUT, batch_size)
+            
+            open_ports = []
+            closed_ports = []
+            filtered_ports = []
+            for port, status, connection_time in results:
+                if status == "open":
                     open_ports.append({
                         "port": port,
-                        "service": self._get_service_name(port),
-                        "connection_time_ms": result.get("connection_time_ms")
+                        "service": _get_service_name(port),
+                        "connection_time_ms": connection_time
                     })
+                elif status == "filtered":
+                    filtered_ports.append(port)
                 else:
                     closed_ports.append(port)
             
@@ -199,49 +591,121 @@ class NetworkMonitorTool:
                 "host": host,
                 "ports_scanned": len(ports),
                 "open_ports_count": len(open_ports),
-                "closed_ports_count": len(closed_ports),
+                # Filtered (timed out) ports are not open, so they count as closed too
+                "closed_ports_count": len(closed_ports) + len(filtered_ports),
+                "filtered_ports_count": len(filtered_ports),
                 "open_ports": open_ports,
                 "scan_duration_seconds": scan_duration,
                 "timestamp": datetime.now().isoformat()
             }
             
+        except socket.gaierror:
+            return {
+                "success": False,
+                "error": "Hostname could not be resolved",
+                "host": host
+            }
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    def dns_lookup(self, hostname: str) -> Dict[str, Any]:
+    def _scan_ports_select(self, address: str, ports: List[int], timeout: float,
+                           batch_size: int = SCAN_CONCURRENCY) -> List[tuple]:
+        """
+        Check ports of a resolved address with non-blocking connects.
+        
+        Each batch of batch_size sockets starts its connects at once and
+        waits on a single selector, so a batch costs one timeout rather than
+        one per port.
+        
+        Returns:
+            (port, "open"/"closed"/"filtered", connection_time_ms) tuples in port order
+        """
+        results = [None] * len(ports)
+        for batch_start in range(0, len(ports), batch_size):
+            batch = range(batch_start, min(batch_start + batch_size, len(ports)))
+            selector = _Selector()
+            socks = []
+            try:
+                start_time = time.perf_counter()
+                for i in batch:
+                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                    sock.setblocking(False)
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RESET)
+                    socks.append(sock)
+                    err = sock.connect_ex((address, ports[i]))
+                    if err == 0:
+                        results[i] = (ports[i], "open", round((time.perf_counter() - start_time) * 1000, 2))
+                    elif err in _CONNECT_PENDING:
+                        selector.register(sock, selectors.EVENT_WRITE, i)
+                    else:
+                        results[i] = (ports[i], "closed", None)
+                
+                # Writable means the connect finished; SO_ERROR tells how
+                deadline = start_time + timeout
+                while selector.get_map():
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    events = selector.select(remaining)
+                    now = time.perf_counter()
+                    for key, _ in events:
+                        selector.unregister(key.fileobj)
+                        i = key.data
+                        if key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                            results[i] = (ports[i], "open", round((now - start_time) * 1000, 2))
+                        else:
+                            results[i] = (ports[i], "closed", None)
+                
+                # Still pending at the deadline: no answer at all
+                for key in list(selector.get_map().values()):
+                    results[key.data] = (ports[key.data], "filtered", None)
+            finally:
+                selector.close()
+                for sock in socks:
+                    sock.close()
+        return results
+    
+    def dns_lookup(self, hostname: str, include_timestamp: bool = True) -> Dict[str, Any]:
         """
         Perform DNS lookup for a hostname.
         
         Args:
             hostname: Hostname to lookup
+            include_timestamp: Add a "timestamp" field
             
         Returns:
             Dictionary with DNS information
         """
         try:
-            # Get IP addresses
-            ip_addresses = socket.gethostbyname_ex(hostname)
-            
-            # Try reverse DNS lookup
-            try:
-                reverse_dns = socket.gethostbyaddr(ip_addresses[2][0])
-                hostname_from_ip = reverse_dns[0]
-            except:
-                hostname_from_ip = None
-            
-            return {
+            # Get IP addresses (A and AAAA in one lookup)
+            resolved, forward_cached = _dns_resolve_ex(hostname)
+            canonical_name, aliases, ipv4_addresses, ipv6_addresses = resolved
+            ip_addresses = ipv4_addresses + ipv6_addresses
+            primary_ip = ip_addresses[0] if ip_addresses else None
+            
+            # Reverse DNS lookup, cached alongside the forward results
+            hostname_from_ip, reverse_cached = None, True
+            if primary_ip:
+                hostname_from_ip, reverse_cached = _reverse_resolve(primary_ip)
+            
+            dns_result = {
                 "success": True,
                 "hostname": hostname,
-                "canonical_name": ip_addresses[0],
-                "aliases": ip_addresses[1],
-                "ip_addresses": ip_addresses[2],
-                "primary_ip": ip_addresses[2][0] if ip_addresses[2] else None,
+                "canonical_name": canonical_name,
+                "aliases": list(aliases),
+                "ip_addresses": ip_addresses,
+                "ipv4_addresses": list(ipv4_addresses),
+                "ipv6_addresses": list(ipv6_addresses),
+                "primary_ip": primary_ip,
                 "reverse_dns": hostname_from_ip,
-                "timestamp": datetime.now().isoformat()
+                "cached": forward_cached and reverse_cached
             }
+            if include_timestamp:
+                dns_result["timestamp"] = datetime.now().isoformat()
+            return dns_result
             
         except socket.gaierror:
             return {
@@ -274,11 +738,19 @@ class NetworkMonitorTool:
                 "host": host,
                 "port": port,
                 "protocol": protocol,
-                "tests": {}
+                "tests": {},
+                "timestamp": datetime.now().isoformat()
             }
             
+            # The probes are independent, so run them side by side: the
+            # multi-second ping hides the DNS and port checks
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                dns_future = executor.submit(self.dns_lookup, host, include_timestamp=False)
+                ping_future = executor.submit(self.ping_host, host, 3)
+                port_future = executor.submit(self.check_port, host, port, include_timestamp=False)
+            
             # DNS lookup
-            dns_result = self.dns_lookup(host)
+            dns_result = dns_future.result()
             results["tests"]["dns"] = {
                 "passed": dns_result["success"],
                 "ip_address": dns_result.get("primary_ip"),
@@ -286,7 +758,7 @@ class NetworkMonitorTool:
             }
             
             # Ping test
-            ping_result = self.ping_host(host, count=3)
+            ping_result = ping_future.result()
             results["tests"]["ping"] = {
                 "passed": ping_result["success"],
                 "avg_latency_ms": ping_result.get("statistics", {}).get("avg_ms"),
@@ -294,7 +766,7 @@ class NetworkMonitorTool:
             }
             
             # Port connectivity
-            port_result = self.check_port(host, port)
+            port_result = port_future.result()
             results["tests"]["port"] = {
                 "passed": port_result.get("is_open", False),
                 "connection_time_ms": port_result.get("connection_time_ms")
@@ -312,26 +784,44 @@ class NetworkMonitorTool:
                 "error": str(e)
             }
     
-    def _get_service_name(self, port: int) -> str:
-        """Get common service name for a port."""
-        services = {
-            21: "FTP",
-            22: "SSH",
-            23: "Telnet",
-            25: "SMTP",
-            53: "DNS",
-            80: "HTTP",
-            110: "POP3",
-            143: "IMAP",
-            443: "HTTPS",
-            445: "SMB",
-            3306: "MySQL",
-            3389: "RDP",
-            5432: "PostgreSQL",
-            5900: "VNC",
-            8080: "HTTP-Alt"
-        }
-        return services.get(port, "Unknown")
+    def warm_dns_cache(self, hosts: List[str], workers: int = DNS_WARM_WORKERS) -> Dict[str, Any]:
+        """
+        Resolve hostnames concurrently to prime the DNS cache.
+        
+        Call before a monitoring round so the first ping/port checks hit
+        the cache the way later rounds do.
+        
+        Args:
+            hosts: Hostnames to resolve
+            workers: Resolver threads to run at once
+            
+        Returns:
+            Dictionary with the resolved and unresolvable hostnames
+        """
+        def resolve(host):
+            try:
+                _dns_resolve(host)
+                return True
+            except (socket.gaierror, UnicodeError):
+                return False
+        
+        try:
+            unique_hosts = list(dict.fromkeys(hosts))
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(unique_hosts)))) as executor:
+                resolved = list(executor.map(resolve, unique_hosts))
+            
+            return {
+                "success": True,
+                "hosts_resolved": sum(resolved),
+                "failed_hosts": [host for host, ok in zip(unique_hosts, resolved) if not ok],
+                "timestamp": datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
 
 # OpenAI function definitions
 OPENAI_FUNCTIONS = [
@@ -351,6 +841,22 @@ OPENAI_FUNCTIONS = [
             }
         }
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "ping_hosts",
+            "description": "Ping several hosts at once and report latency for each",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "hosts": {"type": "array", "items": {"type": "string"}, "description": "Hostnames or IP addresses"},
+                    "count": {"type": "integer", "description": "Number of ping requests per host", "default": 4},
+                    "timeout": {"type": "integer", "description": "Timeout in seconds", "default": 5}
+                },
+                "required": ["hosts"]
+            }
+        }
+    },
     {
         "type": "function",
         "function": {
@@ -412,6 +918,21 @@ OPENAI_FUNCTIONS = [
                 "required": ["host"]
             }
         }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "warm_dns_cache",
+            "description": "Resolve hostnames ahead of time so later checks skip DNS",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "hosts": {"type": "array", "items": {"type": "string"}, "description": "Hostnames to resolve"},
+                    "workers": {"type": "integer", "description": "Concurrent lookups", "default": DNS_WARM_WORKERS}
+                },
+                "required": ["hosts"]
+            }
+        }
     }
 ]
 
@@ -424,12 +945,14 @@ TOOL_INFO = {
     "openai_compatible": True,
     "capabilities": [
         "ping_host",
+        "ping_hosts",
         "check_port",
         "scan_ports",
         "dns_lookup",
-        "test_connection"
+        "test_connection",
+        "warm_dns_cache"
     ],
-    "requirements": ["socket", "subprocess", "platform", "statistics"],
+    "requirements": ["selectors", "socket", "subprocess", "platform", "icmplib (optional)", "fping (optional)"],
     "safety_features": [
         "Timeout protection",
         "Error handling",
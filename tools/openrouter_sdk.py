@@ -4,18 +4,149 @@ Provides comprehensive OOP interface for OpenRouter API operations with focus on
 
 This suite provides:
 - OpenRouterClient: Base client for API interactions
+- AsyncOpenRouterClient: aiohttp-based client for concurrent requests
 - OpenRouterModels: Model management and listing
 - OpenRouterChat: Chat completion operations
 - OpenRouterUtilities: Helper functions for common operations
 """
 
-import requests
+import asyncio
 import json
+import threading
 import time
-from typing import Dict, List, Any, Optional, Iterator, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Iterator, AsyncIterator
 from datetime import datetime
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# requests and aiohttp make up most of this module's import time, so they are
+# imported on first use; OPENAI_FUNCTIONS and OpenRouterUtilities load
+# without them
+_requests = None
+_aiohttp = None
+_httpx = None
+
+
+def _get_requests():
+    """Import requests on first use."""
+    global _requests
+    if _requests is None:
+        import requests
+        _requests = requests
+    return _requests
+
+
+def _get_aiohttp():
+    """Import aiohttp on first use."""
+    global _aiohttp
+    if _aiohttp is None:
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("aiohttp is required for AsyncOpenRouterClient: pip install aiohttp") from None
+        _aiohttp = aiohttp
+    return _aiohttp
+
+
+def _get_httpx():
+    """Import httpx on first use; None when httpx or its HTTP/2 extra (h2) is missing."""
+    global _httpx
+    if _httpx is None:
+        try:
+            import httpx
+            import h2  # noqa: F401
+        except ImportError:
+            return None
+        _httpx = httpx
+    return _httpx
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Read size for streamed completions. SSE responses use chunked transfer
+# encoding, where each chunk is handed over as soon as it arrives, so a large
+# buffer only saves reads and does not delay tokens
+STREAM_CHUNK_SIZE = 65536
+
+def _count_words(text: str) -> int:
+    """
+    Approximate word count: whitespace characters plus one, counted with
+    str.count so no list of words is built.
+    """
+    if not text or text.isspace():
+        return 0
+    return text.count(" ") + text.count("\n") + text.count("\t") + 1
+
+
+def _models_response(body: Any) -> Dict[str, Any]:
+    """
+    Build the get_models() result from a /models response body. A 200 body
+    without a "data" list (such as a provider error) becomes a failure.
+    """
+    if not isinstance(body, dict):
+        return {"success": True, "models": body}
+    if "data" in body:
+        return {"success": True, "models": body["data"]}
+    return {"success": False, "error": body.get("error") or "Response contains no model list"}
+
+
+# Returned by OpenRouterChat._parse_stream_line at the "data: [DONE]" marker
+_STREAM_DONE = object()
+
+
+async def _close_with_loop(session: "aiohttp.ClientSession"):
+    """
+    Async generator kept alongside an aiohttp session. An event loop closes
+    its open async generators when it shuts down (asyncio.run does), which
+    runs the finally block and closes the session on the loop that owns it.
+    """
+    try:
+        yield
+    finally:
+        await session.close()
+
+
+@dataclass(slots=True, frozen=True)
+class OpenRouterResult:
+    """
+    Outcome of one API request, returned by the clients' _make_request.
+    
+    data is the parsed JSON body (or the open response when streaming) on
+    success; error and error_type describe a failed request.
+    """
+    success: bool
+    data: Any = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    
+    def error_dict(self) -> Dict[str, Any]:
+        """The failure dict returned by the public methods."""
+        result = {"success": False, "error": self.error}
+        if self.error_type is not None:
+            result["error_type"] = self.error_type
+        return result
+
 
 class ModelTier(Enum):
     """Model pricing tiers"""
@@ -32,12 +163,19 @@ class OpenRouterClient:
     
     BASE_URL = "https://openrouter.ai/api/v1"
     
+    # Keep-alive connection pool for the session (requests defaults to 10)
+    POOL_CONNECTIONS = 32
+    POOL_MAXSIZE = 64
+    # Responses retried with backoff before giving up
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
     def __init__(
         self, 
         api_key: Optional[str] = None,
         timeout: int = 120,
         max_retries: int = 3,
-        retry_delay: int = 2
+        retry_delay: int = 2,
+        http2: bool = False
     ):
         """
         Initialize OpenRouter client.
@@ -46,7 +184,10 @@ class OpenRouterClient:
             api_key: OpenRouter API key (can be set via OPENROUTER_API_KEY env var)
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
-            retry_delay: Delay between retries in seconds
+            retry_delay: Backoff factor between retries in seconds
+            http2: Send non-streaming requests over HTTP/2 with httpx, so
+                concurrent calls share one multiplexed connection (falls
+                back to requests when httpx[http2] is not installed)
         """
         import os
         self.api_key = api_key or os.environ.get("OPENROUTER_API_KEY")
@@ -56,13 +197,51 @@ class OpenRouterClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.session = requests.Session()
-        self.session.headers.update({
+        requests = _get_requests()
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        headers = {
             "Authorization": f"Bearer {self.api_key}",
             "HTTP-Referer": "https://github.com/cbwinslow/cbw-agents",
             "X-Title": "CBW Agents OpenRouter SDK",
             "Content-Type": "application/json"
-        })
+        }
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        
+        # urllib3 retries connection errors and RETRY_STATUSES with
+        # exponential backoff (honouring Retry-After) on pooled connections
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=retry_delay,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=["GET", "POST"]
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=retry
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        self._request_errors = (requests.RequestException, ValueError)
+        self._http2_client = None
+        httpx = _get_httpx() if http2 else None
+        if httpx is not None:
+            # Streams stay on the requests session; the transport retries
+            # failed connects, _send_http2 the RETRY_STATUSES
+            self._http2_client = httpx.Client(
+                headers=headers,
+                timeout=timeout,
+                transport=httpx.HTTPTransport(
+                    http2=True,
+                    retries=max_retries,
+                    limits=httpx.Limits(max_connections=self.POOL_CONNECTIONS)
+                )
+            )
+            self._request_errors += (httpx.HTTPError,)
         
     def _make_request(
         self, 
@@ -70,9 +249,10 @@ class OpenRouterClient:
         endpoint: str, 
         data: Optional[Dict] = None,
         stream: bool = False
-    ) -> Union[Dict[str, Any], requests.Response]:
+    ) -> OpenRouterResult:
         """
-        Make HTTP request to OpenRouter API with retry logic.
+        Make HTTP request to OpenRouter API; retries are handled by the
+        session's urllib3 Retry policy.
         
         Args:
             method: HTTP method (GET, POST, etc.)
@@ -81,67 +261,258 @@ class OpenRouterClient:
             stream: Whether to stream the response
             
         Returns:
-            Response data or Response object if streaming
+            OpenRouterResult with the response data, or the Response object
+            if streaming
+        """
+        url = f"{self.BASE_URL}{endpoint}"
+        
+        try:
+            if self._http2_client is not None and not stream:
+                response = self._send_http2(method, url, data)
+            elif method == "GET":
+                response = self.session.get(url, timeout=self.timeout)
+            elif method == "POST":
+                response = self.session.post(
+                    url, 
+                    json=data, 
+                    timeout=self.timeout,
+                    stream=stream
+                )
+            else:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+            
+            response.raise_for_status()
+            
+            if stream:
+                return OpenRouterResult(True, response)
+            
+            return OpenRouterResult(True, _loads(response.content))
+            
+        except self._request_errors as e:
+            return OpenRouterResult(False, error=str(e), error_type=type(e).__name__)
+    
+    def _send_http2(self, method: str, url: str, data: Optional[Dict] = None):
+        """
+        Send a request through the HTTP/2 client, retrying RETRY_STATUSES
+        with exponential backoff (or the server's Retry-After).
+        
+        Returns:
+            The final httpx.Response
+        """
+        if method not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        content = _dumps(data) if data is not None else None
+        for attempt in range(self.max_retries + 1):
+            response = self._http2_client.request(method, url, content=content)
+            if response.status_code not in self.RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            retry_after = response.headers.get("Retry-After", "")
+            time.sleep(float(retry_after) if retry_after.isdigit() else self.retry_delay * 2 ** attempt)
+    
+    def get_models(self) -> Dict[str, Any]:
+        """
+        Get list of available models.
+        
+        Returns:
+            Dictionary with models list
+        """
+        result = self._make_request("GET", "/models")
+        if not result.success:
+            return result.error_dict()
+        return _models_response(result.data)
+    
+    def get_limits(self) -> Dict[str, Any]:
+        """
+        Get current API usage limits.
+        
+        Returns:
+            Dictionary with usage limits
+        """
+        result = self._make_request("GET", "/auth/key")
+        if not result.success:
+            return result.error_dict()
+        return {"success": True, "limits": result.data}
+    
+    @property
+    def async_client(self) -> "AsyncOpenRouterClient":
+        """AsyncOpenRouterClient with the same key and settings, created on first use."""
+        if getattr(self, "_async_client", None) is None:
+            self._async_client = AsyncOpenRouterClient(
+                api_key=self.api_key,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                retry_delay=self.retry_delay
+            )
+        return self._async_client
+
+
+class AsyncOpenRouterClient:
+    """
+    Asynchronous client for OpenRouter API interactions (requires aiohttp).
+    Lets callers run many requests concurrently from one event loop, e.g.
+    asyncio.gather(*[chat.acreate_completion(...) for ...]).
+    """
+    
+    BASE_URL = OpenRouterClient.BASE_URL
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        timeout: int = 120,
+        max_retries: int = 3,
+        retry_delay: int = 2,
+        max_concurrency: int = 16
+    ):
+        """
+        Initialize async OpenRouter client.
+        
+        Args:
+            api_key: OpenRouter API key (can be set via OPENROUTER_API_KEY env var)
+            timeout: Request timeout in seconds
+            max_retries: Maximum number of retry attempts
+            retry_delay: Delay between retries in seconds
+            max_concurrency: Maximum requests in flight at once
+        """
+        _get_aiohttp()
+        
+        import os
+        self.api_key = api_key or os.environ.get("OPENROUTER_API_KEY")
+        if not self.api_key:
+            raise ValueError("API key must be provided or set via OPENROUTER_API_KEY environment variable")
+        
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_concurrency = max_concurrency
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": "https://github.com/cbwinslow/cbw-agents",
+            "X-Title": "CBW Agents OpenRouter SDK",
+            "Content-Type": "application/json"
+        }
+        self._session = None
+        self._session_closer = None
+        self._semaphore = None
+        self._loop = None
+    
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """
+        Return the shared session, creating it (and the concurrency limiter)
+        for the running event loop.
+        
+        Both are bound to one loop. The session is closed when its loop shuts
+        down, so a later asyncio.run gets a new one; a session still open on
+        another loop must be closed with close() first.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._loop is not loop:
+            raise RuntimeError(
+                "AsyncOpenRouterClient is bound to another event loop; "
+                "await close() on that loop before using it from a new one"
+            )
+        if self._session is None or self._session.closed:
+            aiohttp = _get_aiohttp()
+            connector = aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=75)
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            # Started on this loop, so the loop's shutdown closes the session
+            self._session_closer = _close_with_loop(self._session)
+            await self._session_closer.asend(None)
+        return self._session
+    
+    async def _make_request_async(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        stream: bool = False
+    ) -> OpenRouterResult:
+        """
+        Make HTTP request to OpenRouter API with retry logic.
+        
+        Args:
+            method: HTTP method (GET, POST)
+            endpoint: API endpoint
+            data: Request payload
+            stream: Whether to stream the response
+            
+        Returns:
+            OpenRouterResult with the response data, or the open
+            ClientResponse if streaming (the caller must release it)
         """
+        if method not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
         url = f"{self.BASE_URL}{endpoint}"
+        session = await self._get_session()
         
         for attempt in range(self.max_retries):
             try:
-                if method == "GET":
-                    response = self.session.get(url, timeout=self.timeout)
-                elif method == "POST":
-                    response = self.session.post(
-                        url, 
-                        json=data, 
-                        timeout=self.timeout,
-                        stream=stream
+                async with self._semaphore:
+                    response = await session.request(
+                        method, url, json=data if method == "POST" else None
                     )
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-                
-                response.raise_for_status()
-                
-                if stream:
-                    return response
-                
-                return response.json()
-                
-            except requests.exceptions.RequestException as e:
+                    try:
+                        response.raise_for_status()
+                        if stream:
+                            return OpenRouterResult(True, response)
+                        return OpenRouterResult(True, _loads(await response.read()))
+                    finally:
+                        if not stream:
+                            response.release()
+                    
+            except (_get_aiohttp().ClientError, asyncio.TimeoutError, ValueError) as e:
                 if attempt == self.max_retries - 1:
-                    return {
-                        "success": False,
-                        "error": str(e),
-                        "error_type": type(e).__name__
-                    }
-                time.sleep(self.retry_delay * (attempt + 1))
+                    return OpenRouterResult(
+                        False, error=str(e) or type(e).__name__, error_type=type(e).__name__
+                    )
+                await asyncio.sleep(self.retry_delay * (attempt + 1))
         
-        return {"success": False, "error": "Max retries exceeded"}
+        return OpenRouterResult(False, error="Max retries exceeded")
     
-    def get_models(self) -> Dict[str, Any]:
+    async def get_models(self) -> Dict[str, Any]:
         """
         Get list of available models.
         
         Returns:
             Dictionary with models list
         """
-        response = self._make_request("GET", "/models")
-        if isinstance(response, dict) and "data" in response:
-            return {"success": True, "models": response["data"]}
-        elif isinstance(response, dict) and "error" in response:
-            return response
-        return {"success": True, "models": response}
+        result = await self._make_request_async("GET", "/models")
+        if not result.success:
+            return result.error_dict()
+        return _models_response(result.data)
     
-    def get_limits(self) -> Dict[str, Any]:
+    async def get_limits(self) -> Dict[str, Any]:
         """
         Get current API usage limits.
         
         Returns:
             Dictionary with usage limits
         """
-        response = self._make_request("GET", "/auth/key")
-        if isinstance(response, dict) and "error" not in response:
-            return {"success": True, "limits": response}
-        return response
+        result = await self._make_request_async("GET", "/auth/key")
+        if not result.success:
+            return result.error_dict()
+        return {"success": True, "limits": result.data}
+    
+    async def close(self):
+        """Close the underlying session and its connection pool."""
+        closer, self._session_closer = self._session_closer, None
+        if closer is not None:
+            # Runs the closer's finally block, which closes the session
+            await closer.aclose()
+        self._session = None
+    
+    async def __aenter__(self) -> "AsyncOpenRouterClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
 
 
 class OpenRouterModels:
@@ -158,9 +529,74 @@ class OpenRouterModels:
             client: OpenRouterClient instance
         """
         self.client = client
-        self._models_cache = None
-        self._cache_time = None
+        # Model lists keyed by tier value ("all", "free", "paid"), all
+        # built by one fetch and expiring together
+        self._cache: Dict[str, List[Dict[str, Any]]] = {}
+        # Past the soft expiry the cached lists are still served while a
+        # background refresh runs; past the hard expiry callers wait for
+        # a fresh fetch
+        self._cache_expires = 0.0
+        self._cache_hard_expires = 0.0
         self._cache_ttl = 3600  # 1 hour
+        self._cache_hard_ttl = 7200  # 2 hours
+        # Model id -> model dict for the cached list
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        # Held while refetching so concurrent callers do not all hit /models
+        self._refresh_lock = threading.Lock()
+        # One background refresh at a time
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._refreshing = False
+        self._refreshing_lock = threading.Lock()
+        # find_model matches by (query, tier, generation); the generation
+        # is bumped by every refresh, so results never outlive their list
+        self._generation = 0
+        self._query_cache = lru_cache(maxsize=256)(self._find_model_impl)
+    
+    def _refresh_models(self) -> Optional[Dict[str, Any]]:
+        """
+        Fetch /models and rebuild the cache; call with _refresh_lock held.
+        
+        Returns:
+            The error result when the fetch failed, else None
+        """
+        result = self.client.get_models()
+        if not result.get("success", True):
+            return result
+        models = result.get("models", [])
+        
+        # Partition by tier in one pass, so tier lookups never filter
+        # again; "_is_free" saves re-parsing the pricing strings wherever
+        # the model dict is checked later, and "_search" is the lowercased
+        # id/name text find_model matches against
+        free, paid = [], []
+        for m in models:
+            m["_is_free"] = OpenRouterUtilities.is_free_model(m)
+            m["_search"] = (m.get("id", "") + "\x00" + m.get("name", "")).lower()
+            (free if m["_is_free"] else paid).append(m)
+        
+        # Publish the new entries before the new expiry
+        self._by_id = {m["id"]: m for m in models if "id" in m}
+        self._cache = {
+            ModelTier.ALL.value: models,
+            ModelTier.FREE.value: free,
+            ModelTier.PAID.value: paid
+        }
+        self._generation += 1
+        self._query_cache.cache_clear()
+        now = time.monotonic()
+        self._cache_hard_expires = now + self._cache_hard_ttl
+        self._cache_expires = now + self._cache_ttl
+        return None
+    
+    def _background_refresh(self):
+        """Refresh a stale cache off the caller's thread; errors keep the stale lists."""
+        try:
+            with self._refresh_lock:
+                # Skip if a foreground refresh got there first
+                if time.monotonic() >= self._cache_expires:
+                    self._refresh_models()
+        finally:
+            self._refreshing = False
     
     def list_models(
         self, 
@@ -177,32 +613,29 @@ class OpenRouterModels:
         Returns:
             Dictionary with filtered models
         """
-        # Check cache
-        if not refresh_cache and self._models_cache and self._cache_time:
-            if time.time() - self._cache_time < self._cache_ttl:
-                models = self._models_cache
-            else:
-                result = self.client.get_models()
-                if not result.get("success", True):
-                    return result
-                models = result.get("models", [])
-                self._models_cache = models
-                self._cache_time = time.time()
-        else:
-            result = self.client.get_models()
-            if not result.get("success", True):
-                return result
-            models = result.get("models", [])
-            self._models_cache = models
-            self._cache_time = time.time()
-        
-        # Filter by tier using utility method for consistency
-        if tier == ModelTier.FREE:
-            filtered = [m for m in models if OpenRouterUtilities.is_free_model(m)]
-        elif tier == ModelTier.PAID:
-            filtered = [m for m in models if not OpenRouterUtilities.is_free_model(m)]
-        else:
-            filtered = models
+        filtered = None
+        if not refresh_cache:
+            now = time.monotonic()
+            if now < self._cache_hard_expires:
+                filtered = self._cache.get(tier.value)
+            # Stale but usable: answer now and revalidate in the background
+            if filtered is not None and now >= self._cache_expires:
+                with self._refreshing_lock:
+                    start = not self._refreshing
+                    self._refreshing = True
+                if start:
+                    self._executor.submit(self._background_refresh)
+        
+        if filtered is None:
+            with self._refresh_lock:
+                # Another caller may have refreshed while we waited
+                if not refresh_cache and time.monotonic() < self._cache_expires:
+                    filtered = self._cache.get(tier.value)
+                if filtered is None:
+                    error = self._refresh_models()
+                    if error is not None:
+                        return error
+                    filtered = self._cache[tier.value]
         
         return {
             "success": True,
@@ -235,12 +668,7 @@ class OpenRouterModels:
         if not result["success"]:
             return result
         
-        query_lower = query.lower()
-        matched = [
-            m for m in result["models"]
-            if query_lower in m.get("id", "").lower() 
-            or query_lower in m.get("name", "").lower()
-        ]
+        matched = list(self._query_cache(query.lower(), tier.value, self._generation))
         
         return {
             "success": True,
@@ -249,6 +677,10 @@ class OpenRouterModels:
             "query": query
         }
     
+    def _find_model_impl(self, query_lower: str, tier_value: str, generation: int) -> tuple:
+        """Models of a cached tier list matching a lowercased query (memoized by find_model)."""
+        return tuple(m for m in self._cache[tier_value] if query_lower in m["_search"])
+    
     def get_model_info(self, model_id: str) -> Dict[str, Any]:
         """
         Get detailed information about a specific model.
@@ -263,18 +695,48 @@ class OpenRouterModels:
         if not result["success"]:
             return result
         
-        for model in result["models"]:
-            if model.get("id") == model_id:
-                return {
-                    "success": True,
-                    "model": model
-                }
+        model = self._by_id.get(model_id)
+        if model is not None:
+            return {
+                "success": True,
+                "model": model
+            }
         
         return {
             "success": False,
             "error": f"Model not found: {model_id}"
         }
     
+    def get_models_info(self, model_ids: List[str]) -> Dict[str, Any]:
+        """
+        Get information about several models with a single cache check.
+        
+        Args:
+            model_ids: Model identifiers, e.g. candidate models to validate
+        
+        Returns:
+            Dictionary with the found models keyed by id and the missing ids
+        """
+        result = self.list_models()
+        if not result["success"]:
+            return result
+        
+        by_id = self._by_id
+        found = {}
+        missing = []
+        for model_id in model_ids:
+            model = by_id.get(model_id)
+            if model is not None:
+                found[model_id] = model
+            else:
+                missing.append(model_id)
+        
+        return {
+            "success": True,
+            "models": found,
+            "missing": missing
+        }
+
     def get_recommended_free_model(self, use_case: str = "general") -> Dict[str, Any]:
         """
         Get recommended free model for a specific use case.
@@ -309,15 +771,17 @@ class OpenRouterChat:
     Handles message formatting, completion requests, and response processing.
     """
     
-    def __init__(self, client: OpenRouterClient):
+    def __init__(self, client: OpenRouterClient, max_history_turns: Optional[int] = 50):
         """
         Initialize chat manager.
         
         Args:
             client: OpenRouterClient instance
+            max_history_turns: User/assistant exchanges kept in the
+                conversation history (oldest dropped first); None keeps all
         """
         self.client = client
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=max_history_turns * 2 if max_history_turns else None)
     
     def create_completion(
         self,
@@ -348,50 +812,117 @@ class OpenRouterChat:
         Returns:
             Dictionary with completion result
         """
-        payload = {
-            "model": model,
-            "messages": messages,
-            "temperature": temperature,
-            "top_p": top_p,
-            "frequency_penalty": frequency_penalty,
-            "presence_penalty": presence_penalty,
-            **kwargs
-        }
-        
-        if max_tokens:
-            payload["max_tokens"] = max_tokens
+        payload = self._build_payload(
+            model, messages, stream, temperature=temperature, max_tokens=max_tokens,
+            top_p=top_p, frequency_penalty=frequency_penalty,
+            presence_penalty=presence_penalty, **kwargs
+        )
         
         if stream:
-            payload["stream"] = True
-            response = self.client._make_request(
+            result = self.client._make_request(
                 "POST", 
                 "/chat/completions", 
                 data=payload,
                 stream=True
             )
             
-            if isinstance(response, dict) and "error" in response:
-                return response
+            if not result.success:
+                return result.error_dict()
             
             return {
                 "success": True,
                 "stream": True,
-                "response": response
+                "response": result.data
             }
         
-        response = self.client._make_request(
+        result = self.client._make_request(
             "POST", 
             "/chat/completions", 
             data=payload
         )
         
-        if isinstance(response, dict) and "error" in response:
-            return response
+        return self._completion_result(messages, result)
+    
+    async def acreate_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 1.0,
+        max_tokens: Optional[int] = None,
+        top_p: float = 1.0,
+        frequency_penalty: float = 0.0,
+        presence_penalty: float = 0.0,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Create a chat completion without blocking the event loop.
+        
+        Takes the same arguments as create_completion (except stream; use
+        acreate_streaming_completion) and goes through client.async_client,
+        so many completions can be awaited together with asyncio.gather.
         
-        # Store in conversation history
+        Returns:
+            Dictionary with completion result
+        """
+        payload = self._build_payload(
+            model, messages, False, temperature=temperature, max_tokens=max_tokens,
+            top_p=top_p, frequency_penalty=frequency_penalty,
+            presence_penalty=presence_penalty, **kwargs
+        )
+        result = await self.client.async_client._make_request_async(
+            "POST",
+            "/chat/completions",
+            data=payload
+        )
+        return self._completion_result(messages, result)
+    
+    @staticmethod
+    def _build_payload(
+        model: str,
+        messages: List[Dict[str, str]],
+        stream: bool,
+        temperature: float = 1.0,
+        max_tokens: Optional[int] = None,
+        top_p: float = 1.0,
+        frequency_penalty: float = 0.0,
+        presence_penalty: float = 0.0,
+        **extra
+    ) -> Dict[str, Any]:
+        """Build the /chat/completions request body."""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "top_p": top_p,
+            "frequency_penalty": frequency_penalty,
+            "presence_penalty": presence_penalty,
+            **extra
+        }
+        
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        
+        if stream:
+            payload["stream"] = True
+        
+        return payload
+    
+    def _completion_result(self, messages: List[Dict[str, str]], result: OpenRouterResult) -> Dict[str, Any]:
+        """Record a completion in the history and wrap it in the result dict."""
+        if not result.success:
+            return result.error_dict()
+        
+        response = result.data
+        # Provider failures can arrive as a 200 response with an error body
+        if "error" in response:
+            return {"success": False, "error": response["error"]}
+        
+        # Store in conversation history; messages already in it (e.g. sent
+        # back by chat(use_history=True)) are not recorded a second time
         if "choices" in response and len(response["choices"]) > 0:
             assistant_message = response["choices"][0]["message"]
-            self.conversation_history.extend(messages)
+            recorded = {id(m) for m in self.conversation_history}
+            self.conversation_history.extend(m for m in messages if id(m) not in recorded)
             self.conversation_history.append(assistant_message)
         
         return {
@@ -431,21 +962,79 @@ class OpenRouterChat:
         
         response = result["response"]
         
-        for line in response.iter_lines():
-            if line:
-                line_text = line.decode('utf-8')
-                if line_text.startswith('data: '):
-                    data_text = line_text[6:]
-                    if data_text == '[DONE]':
+        for line in response.iter_lines(chunk_size=STREAM_CHUNK_SIZE, decode_unicode=False):
+            # Blank separators and ": keep-alive" comments carry no data
+            if line and line[0] != 0x3A:
+                content = self._parse_stream_line(line)
+                if content is _STREAM_DONE:
+                    break
+                if content is not None:
+                    yield content
+    
+    async def acreate_streaming_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Create a streaming chat completion without blocking the event loop.
+        
+        Args:
+            model: Model identifier
+            messages: List of message dictionaries
+            **kwargs: Additional parameters (as for create_completion)
+            
+        Yields:
+            Content chunks from the stream
+        """
+        payload = self._build_payload(model, messages, True, **kwargs)
+        result = await self.client.async_client._make_request_async(
+            "POST",
+            "/chat/completions",
+            data=payload,
+            stream=True
+        )
+        
+        if not result.success:
+            yield json.dumps({"error": result.error})
+            return
+        
+        response = result.data
+        try:
+            async for line in response.content:
+                line = line.rstrip(b"\r\n")
+                if line and line[0] != 0x3A:
+                    content = self._parse_stream_line(line)
+                    if content is _STREAM_DONE:
                         break
-                    try:
-                        chunk = json.loads(data_text)
-                        if "choices" in chunk and len(chunk["choices"]) > 0:
-                            delta = chunk["choices"][0].get("delta", {})
-                            if "content" in delta:
-                                yield delta["content"]
-                    except json.JSONDecodeError:
-                        continue
+                    if content is not None:
+                        yield content
+        finally:
+            response.release()
+    
+    @staticmethod
+    def _parse_stream_line(line: bytes) -> Optional[str]:
+        """
+        Decode one server-sent-events line of a streaming completion.
+        
+        Returns:
+            The delta content, _STREAM_DONE at the end marker, or None for
+            lines without content
+        """
+        # Work on the raw bytes; orjson parses them without a decode step
+        if not line.startswith(b'data: '):
+            return None
+        data = line[6:]
+        if data == b'[DONE]':
+            return _STREAM_DONE
+        try:
+            chunk = _loads(data)
+        except ValueError:
+            return None
+        if "choices" in chunk and len(chunk["choices"]) > 0:
+            return chunk["choices"][0].get("delta", {}).get("content")
+        return None
     
     def chat(
         self,
@@ -468,13 +1057,10 @@ class OpenRouterChat:
         Returns:
             Dictionary with chat response
         """
-        messages = []
-        
-        if system_message:
-            messages.append({"role": "system", "content": system_message})
+        messages = [{"role": "system", "content": system_message}] if system_message else []
         
         if use_history:
-            messages.extend(self.conversation_history)
+            messages += self.conversation_history
         
         messages.append({"role": "user", "content": message})
         
@@ -487,7 +1073,7 @@ class OpenRouterChat:
         Returns:
             Dictionary with success status
         """
-        self.conversation_history = []
+        self.conversation_history.clear()
         return {"success": True, "message": "Conversation history cleared"}
     
     def get_history(self) -> Dict[str, Any]:
@@ -499,7 +1085,7 @@ class OpenRouterChat:
         """
         return {
             "success": True,
-            "history": self.conversation_history,
+            "history": list(self.conversation_history),
             "count": len(self.conversation_history)
         }
 
@@ -527,12 +1113,27 @@ class OpenRouterUtilities:
             return len(text) // 4
         elif method == "words":
             # Rough estimate: ~0.75 tokens per word
-            return int(len(text.split()) * 0.75)
+            return int(_count_words(text) * 0.75)
         elif method == "chars":
             # Character-based estimate
             return len(text) // 4
         return 0
     
+    @staticmethod
+    def estimate_tokens_batch(texts: List[str], method: str = "simple") -> List[int]:
+        """
+        Estimate token counts for many texts at once.
+        
+        Args:
+            texts: Texts to estimate
+            method: Estimation method (simple, words, chars)
+            
+        Returns:
+            Estimated token count per text
+        """
+        estimate = OpenRouterUtilities.estimate_tokens
+        return [estimate(text, method) for text in texts]
+    
     @staticmethod
     def format_messages(
         user_message: str,
@@ -628,10 +1229,8 @@ class OpenRouterUtilities:
         Returns:
             Combined output string
         """
-        output = []
-        for chunk in iterator:
-            output.append(chunk)
-        return "".join(output)
+        # str.join drains the iterator in C; no Python-level append loop
+        return "".join(iterator)
     
     @staticmethod
     def print_streaming_output(iterator: Iterator[str], prefix: str = "") -> str:
@@ -695,6 +1294,11 @@ class OpenRouterUtilities:
         Returns:
             True if model is free
         """
+        # Set on models that came through OpenRouterModels' cache
+        is_free = model_info.get("_is_free")
+        if is_free is not None:
+            return is_free
+        
         pricing = model_info.get("pricing", {})
         prompt_price = float(pricing.get("prompt", "0"))
         completion_price = float(pricing.get("completion", "0"))
@@ -833,6 +1437,10 @@ OPENAI_FUNCTIONS = [
     }
 ]
 
+# OPENAI_FUNCTIONS serialized once; when composing a raw request body, splice
+# these bytes in as the "tools" value instead of re-encoding the list per call
+OPENAI_FUNCTIONS_JSON: bytes = _dumps(OPENAI_FUNCTIONS)
+
 # Tool metadata
 TOOL_INFO = {
     "name": "openrouter_sdk",
@@ -846,15 +1454,18 @@ TOOL_INFO = {
         "find_model",
         "chat_completion",
         "streaming_chat",
+        "async_chat",
         "token_estimation",
+        "batch_token_estimation",
         "cost_calculation",
         "model_recommendations"
     ],
-    "requirements": ["requests"],
+    "requirements": ["requests", "aiohttp (optional)", "httpx[http2] (optional)", "orjson (optional)"],
     "features": [
         "OOP design with multiple classes",
         "Support for free models",
         "Streaming support",
+        "Async client for concurrent requests",
         "Conversation history",
         "Token estimation utilities",
         "Error handling and retries",
@@ -3,44 +3,213 @@ Price Data Collector Tool (OpenAI-Compatible)
 Collects and tracks price data from various sources with historical tracking.
 """
 
-import requests
+import urllib3
+from urllib3.util.retry import Retry
 import json
+import math
 import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from urllib.parse import urljoin
 from bs4 import BeautifulSoup
+import soupsieve
 import re
 
+# lxml's C parser builds the soup several times faster than html.parser
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+# Connection PRAGMAs applied on open; override per instance via ``pragmas``
+# (set a key to None to skip it). WAL lets get_price_history/get_price_alerts
+# read while collect_price writes, and NORMAL syncs only at checkpoints
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -20000,
+}
+
+# Items fetched concurrently by collect_multiple; scraping is network-bound,
+# so threads overlap the waits while inserts stay on the calling thread
+COLLECT_WORKERS = 16
+
+# First number in a price string: "1,299.99" in "$1,299.99 (was $1,499)".
+# Commas only count as thousands separators between groups of three digits
+_PRICE_RE = re.compile(r'(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?|\.\d+')
+
+# Auto-detect candidates with longer text are wrappers or descriptions, not
+# a price label, and are skipped without searching them
+MAX_PRICE_TEXT_LENGTH = 64
+
+# Successful scrapes are reused for this many seconds (per URL and
+# selector), so bursts of polls for one page fetch and parse it once
+SCRAPE_CACHE_TTL = 30
+SCRAPE_CACHE_SIZE = 512
+
+# Bytes of a page read for price extraction; prices sit well within the
+# first 2 MB, so the rest of an oversized page is neither downloaded nor parsed
+MAX_PAGE_BYTES = 2_000_000
+
+# Content types parsed as HTML (a response without one is parsed too)
+_HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Selectors tried by _auto_detect_price, in order of preference. They are
+# also compiled into one combined selector so the page is walked once
+_PRICE_SELECTORS = (
+    '[class*="price"]',
+    '[id*="price"]',
+    '[itemprop="price"]',
+    '.product-price',
+    '#price',
+    'span.price',
+    'div.price'
+)
+_PRICE_PATTERNS = [soupsieve.compile(selector) for selector in _PRICE_SELECTORS]
+_PRICE_SELECTOR_ALL = soupsieve.compile(', '.join(_PRICE_SELECTORS))
+
+# One SQL string for every insert, so sqlite3's statement cache reuses the
+# compiled statement instead of re-preparing it per call
+_INSERT_SQL = (
+    "INSERT INTO price_data (source, item_id, item_name, price, currency, timestamp, url, metadata) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class _ConnectionOwner:
+    """Held in a thread's local storage; collected when the thread exits."""
+    __slots__ = ('__weakref__',)
+
+
+def _release_connection(connections: List[sqlite3.Connection], lock: threading.Lock,
+                        conn: sqlite3.Connection):
+    """Close the connection of an exited thread, unless close() already has."""
+    with lock:
+        if conn not in connections:
+            return
+        connections.remove(conn)
+    conn.close()
+
+
 class PriceDataCollectorTool:
     """
     OpenAI-compatible price data collector with historical tracking.
     Supports multiple data sources, APIs, and web scraping for price information.
+    
+    Use it as a context manager (``with PriceDataCollectorTool(...) as tool:``)
+    or call close() when done, so the database is checkpointed and closed.
     """
     
-    def __init__(self, db_path: str = "./price_data.db", timeout: int = 30):
+    # Keep-alive pools kept per host (urllib3 defaults to 10); maxsize
+    # covers every collect_multiple worker hitting one host
+    POOL_CONNECTIONS = 32
+    POOL_MAXSIZE = 64
+    # Gateway errors retried with backoff before a scrape fails
+    RETRY_STATUSES = (502, 503, 504)
+    # Redirect hops followed per page (http -> https -> www -> canonical ...)
+    MAX_REDIRECTS = 30
+    
+    def __init__(self, db_path: str = "./price_data.db", timeout: int = 30,
+                 pragmas: Optional[Dict[str, Any]] = None,
+                 scrape_cache_ttl: float = SCRAPE_CACHE_TTL):
         """
         Initialize price data collector.
         
         Args:
             db_path: Path to SQLite database for price history
             timeout: Request timeout in seconds
+            pragmas: Overrides for DEFAULT_PRAGMAS (None values are skipped)
+            scrape_cache_ttl: Seconds a successful scrape of a page is reused
+                (0 disables the cache)
         """
         self.db_path = Path(db_path)
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; PriceCollector/1.0)'
-        })
-        self.conn = None
-        self._initialize_database()
+        self.scrape_cache_ttl = scrape_cache_ttl
+        # (url, selector) -> (expires, result), least recently used first
+        self._scrape_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._scrape_cache_lock = threading.Lock()
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        # An in-memory database has no file to keep a write-ahead log for
+        self._in_memory = db_path == ":memory:"
+        if self._in_memory:
+            self.pragmas.pop("journal_mode", None)
+        # A bare urllib3 pool: scraping only needs GET, and skipping the
+        # requests Session layer halves the client CPU per page
+        self.http = urllib3.PoolManager(
+            num_pools=self.POOL_CONNECTIONS,
+            maxsize=self.POOL_MAXSIZE,
+            headers={
+                'User-Agent': 'Mozilla/5.0 (compatible; PriceCollector/1.0)',
+                **urllib3.util.make_headers(accept_encoding=True)
+            },
+            # urllib3 counts redirects against total, so each budget is set
+            # on its own; redirects get requests' allowance of 30
+            retries=Retry(total=None, connect=2, read=2, status=2,
+                          redirect=self.MAX_REDIRECTS, backoff_factor=0.3,
+                          status_forcelist=self.RETRY_STATUSES)
+        )
+        # One connection per thread (see conn), tracked so close() closes all
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        conn = self.conn
+        if not self._in_memory:
+            self._initialize_database(conn)
     
-    def _initialize_database(self):
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        The calling thread's database connection, opened on first use.
+        
+        An in-memory database exists only inside its connection, so for
+        ':memory:' every thread shares one. A file database connection is
+        closed when its thread exits.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if self._in_memory:
+                # Opened under the lock so racing threads share one database
+                with self._connections_lock:
+                    if not self._connections:
+                        self._connections.append(self._connect())
+                    conn = self._connections[0]
+            else:
+                conn = self._connect()
+                with self._connections_lock:
+                    self._connections.append(conn)
+                # threading.local drops a thread's values when it exits; the
+                # owner is then collected and its finalizer closes the connection
+                owner = _ConnectionOwner()
+                weakref.finalize(owner, _release_connection,
+                                 self._connections, self._connections_lock, conn)
+                self._local.owner = owner
+            self._local.conn = conn
+        return conn
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a database connection with the configured PRAGMAs."""
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            if value is not None:
+                conn.execute(f"PRAGMA {name}={value}")
+        # Each new in-memory connection is a new, empty database, including
+        # the one opened when the collector is used again after close()
+        if self._in_memory:
+            self._initialize_database(conn)
+        return conn
+    
+    def _initialize_database(self, conn: sqlite3.Connection):
         """Initialize SQLite database for price tracking."""
-        self.conn = sqlite3.connect(str(self.db_path))
-        self.conn.row_factory = sqlite3.Row
-        cursor = self.conn.cursor()
+        cursor = conn.cursor()
         
         # Create price_data table
         cursor.execute('''
@@ -57,13 +226,16 @@ class PriceDataCollectorTool:
             )
         ''')
         
-        # Create index for faster queries
+        # Index for per-item queries; price is included so get_price_alerts
+        # reads the latest price from the index alone. It supersedes the
+        # older idx_item_timestamp, which covered only (item_id, timestamp)
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_item_timestamp 
-            ON price_data(item_id, timestamp)
+            CREATE INDEX IF NOT EXISTS idx_item_ts_price
+            ON price_data(item_id, timestamp, price)
         ''')
+        cursor.execute('DROP INDEX IF EXISTS idx_item_timestamp')
         
-        self.conn.commit()
+        conn.commit()
     
     def collect_price(self, source: str, item_id: str, url: Optional[str] = None,
                      selector: Optional[str] = None, api_key: Optional[str] = None) -> Dict[str, Any]:
@@ -80,121 +252,215 @@ class PriceDataCollectorTool:
         Returns:
             Dictionary with collected price data
         """
+        row, result = self._collect_price_nocommit(source, item_id, url, selector, api_key)
+        if row is None:
+            return result
+        
+        try:
+            self._store_rows([row])
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "error_type": type(e).__name__
+            }
+        
+        return result
+    
+    def _collect_price_nocommit(self, source: str, item_id: str, url: Optional[str] = None,
+                                selector: Optional[str] = None,
+                                api_key: Optional[str] = None) -> Tuple[Optional[tuple], Dict[str, Any]]:
+        """
+        Fetch a price and build its price_data row without writing it.
+        
+        Returns:
+            (row, result) tuple; row is None when collection failed
+        """
         try:
             if url and url.startswith('http'):
                 # Web scraping mode
-                if selector:
-                    result = self._scrape_price(url, selector)
-                else:
-                    result = self._auto_detect_price(url)
+                result = self._scrape_cached(url, selector)
             elif api_key:
                 # API mode (placeholder for various APIs)
                 result = self._fetch_from_api(source, item_id, api_key)
             else:
-                return {
+                return None, {
                     "success": False,
                     "error": "Either URL with selector or API key must be provided"
                 }
             
             if not result["success"]:
-                return result
+                return None, result
             
-            # Store in database
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT INTO price_data (source, item_id, item_name, price, currency, timestamp, url, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            timestamp = datetime.now().isoformat()
+            # Scrapes usually carry no metadata; store NULL rather than "{}"
+            metadata = result.get("metadata")
+            row = (
                 source,
                 item_id,
                 result.get("item_name", ""),
                 result["price"],
                 result.get("currency", "USD"),
-                datetime.now().isoformat(),
+                timestamp,
                 url or "",
-                json.dumps(result.get("metadata", {}))
-            ))
-            self.conn.commit()
+                json.dumps(metadata, separators=(',', ':')) if metadata else None
+            )
             
-            return {
+            return row, {
                 "success": True,
                 "source": source,
                 "item_id": item_id,
                 "price": result["price"],
                 "currency": result.get("currency", "USD"),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
                 "item_name": result.get("item_name", "")
             }
             
         except Exception as e:
-            return {
+            return None, {
                 "success": False,
                 "error": str(e),
                 "error_type": type(e).__name__
             }
     
-    def collect_multiple(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _collect_item_nocommit(self, item: Dict[str, Any]) -> Tuple[Optional[tuple], Dict[str, Any]]:
+        """_collect_price_nocommit for one collect_multiple item dictionary."""
+        return self._collect_price_nocommit(
+            source=item.get("source", "unknown"),
+            item_id=item.get("item_id", ""),
+            url=item.get("url"),
+            selector=item.get("selector"),
+            api_key=item.get("api_key")
+        )
+    
+    def _store_rows(self, rows: List[tuple]):
+        """Insert price_data rows in a single transaction (one commit)."""
+        conn = self.conn
+        if len(rows) == 1:
+            with conn:
+                conn.execute(_INSERT_SQL, rows[0])
+            return
+        
+        # Keep a batch's dirty pages in the page cache until the commit
+        # rather than spilling them to the WAL mid-transaction
+        conn.execute("PRAGMA cache_spill=OFF")
+        try:
+            with conn:
+                conn.executemany(_INSERT_SQL, rows)
+        finally:
+            conn.execute("PRAGMA cache_spill=ON")
+    
+    def collect_multiple(self, items: List[Dict[str, Any]],
+                         max_workers: int = COLLECT_WORKERS) -> Dict[str, Any]:
         """
         Collect price data for multiple items.
         
         Args:
             items: List of item dictionaries with source, item_id, url, etc.
+            max_workers: Maximum number of items fetched concurrently
             
         Returns:
             Dictionary with collection results
         """
         results = []
-        successful = 0
-        failed = 0
+        rows = []
         
-        for item in items:
-            result = self.collect_price(
-                source=item.get("source", "unknown"),
-                item_id=item.get("item_id", ""),
-                url=item.get("url"),
-                selector=item.get("selector"),
-                api_key=item.get("api_key")
-            )
+        workers = max(1, min(max_workers, len(items)))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                collected = list(executor.map(self._collect_item_nocommit, items))
+        else:
+            collected = [self._collect_item_nocommit(item) for item in items]
+        
+        for row, result in collected:
             results.append(result)
-            
-            if result["success"]:
-                successful += 1
-            else:
-                failed += 1
+            if row is not None:
+                rows.append(row)
+        
+        # Store every collected price with one commit instead of one per item
+        if rows:
+            try:
+                self._store_rows(rows)
+            except Exception as e:
+                error = {
+                    "success": False,
+                    "error": str(e),
+                    "error_type": type(e).__name__
+                }
+                results = [error if result["success"] else result for result in results]
+        
+        successful = sum(1 for result in results if result["success"])
         
         return {
             "success": True,
             "total_items": len(items),
             "successful": successful,
-            "failed": failed,
+            "failed": len(results) - successful,
             "results": results
         }
     
-    def get_price_history(self, item_id: str, days: int = 30) -> Dict[str, Any]:
+    def get_price_history(self, item_id: str, days: int = 30,
+                          include_history: bool = True) -> Dict[str, Any]:
         """
         Get price history for an item.
         
         Args:
             item_id: Unique identifier for the item
             days: Number of days of history to retrieve
+            include_history: Return the individual entries; when False only
+                the statistics are computed, by SQLite from the index
             
         Returns:
             Dictionary with price history
         """
         try:
+            # Plain tuples; entries are built from the selected columns
             cursor = self.conn.cursor()
+            cursor.row_factory = None
             
             since_date = (datetime.now() - timedelta(days=days)).isoformat()
             
-            cursor.execute('''
-                SELECT * FROM price_data
-                WHERE item_id = ? AND timestamp >= ?
-                ORDER BY timestamp ASC
-            ''', (item_id, since_date))
-            
-            rows = cursor.fetchall()
-            
-            if not rows:
+            if include_history:
+                cursor.execute('''
+                    SELECT timestamp, price, currency, source FROM price_data
+                    WHERE item_id = ? AND timestamp >= ?
+                    ORDER BY timestamp ASC
+                ''', (item_id, since_date))
+                
+                # One pass builds the entries and the running statistics
+                history = []
+                total = 0.0
+                min_price = math.inf
+                max_price = -math.inf
+                for timestamp, price, currency, source in cursor:
+                    history.append({"timestamp": timestamp, "price": price, "currency": currency, "source": source})
+                    total += price
+                    if price < min_price:
+                        min_price = price
+                    if price > max_price:
+                        max_price = price
+                count = len(history)
+                if count:
+                    avg_price = total / count
+                    current_price = history[-1]["price"]
+            else:
+                # Aggregated from idx_item_ts_price without reading the table
+                history = None
+                cursor.execute('''
+                    SELECT COUNT(*), AVG(price), MIN(price), MAX(price) FROM price_data
+                    WHERE item_id = ? AND timestamp >= ?
+                ''', (item_id, since_date))
+                count, avg_price, min_price, max_price = cursor.fetchone()
+                if count:
+                    cursor.execute('''
+                        SELECT price FROM price_data
+                        WHERE item_id = ? AND timestamp >= ?
+                        ORDER BY timestamp DESC
+                        LIMIT 1
+                    ''', (item_id, since_date))
+                    current_price = cursor.fetchone()[0]
+            
+            if not count:
                 return {
                     "success": True,
                     "item_id": item_id,
@@ -203,39 +469,22 @@ class PriceDataCollectorTool:
                     "message": "No price history found"
                 }
             
-            history = []
-            prices = []
-            
-            for row in rows:
-                entry = dict(row)
-                history.append({
-                    "timestamp": entry["timestamp"],
-                    "price": entry["price"],
-                    "currency": entry["currency"],
-                    "source": entry["source"]
-                })
-                prices.append(entry["price"])
-            
-            # Calculate statistics
-            avg_price = sum(prices) / len(prices)
-            min_price = min(prices)
-            max_price = max(prices)
-            current_price = prices[-1]
-            
-            return {
+            result = {
                 "success": True,
                 "item_id": item_id,
-                "count": len(history),
-                "history": history,
-                "statistics": {
-                    "current_price": current_price,
-                    "average_price": round(avg_price, 2),
-                    "min_price": min_price,
-                    "max_price": max_price,
-                    "price_range": round(max_price - min_price, 2),
-                    "volatility": round((max_price - min_price) / avg_price * 100, 2) if avg_price > 0 else 0
-                }
+                "count": count
+            }
+            if history is not None:
+                result["history"] = history
+            result["statistics"] = {
+                "current_price": current_price,
+                "average_price": round(avg_price, 2),
+                "min_price": min_price,
+                "max_price": max_price,
+                "price_range": round(max_price - min_price, 2),
+                "volatility": round((max_price - min_price) / avg_price * 100, 2) if avg_price > 0 else 0
             }
+            return result
             
         except Exception as e:
             return {
@@ -259,9 +508,9 @@ class PriceDataCollectorTool:
         try:
             cursor = self.conn.cursor()
             
-            # Get latest price
+            # Get latest price (answered from idx_item_ts_price)
             cursor.execute('''
-                SELECT * FROM price_data
+                SELECT price FROM price_data
                 WHERE item_id = ?
                 ORDER BY timestamp DESC
                 LIMIT 1
@@ -275,7 +524,7 @@ class PriceDataCollectorTool:
                     "error": "No price data found for item"
                 }
             
-            current_price = row["price"]
+            current_price = row[0]
             alerts = []
             
             if threshold_low and current_price < threshold_low:
@@ -308,13 +557,91 @@ class PriceDataCollectorTool:
                 "error": str(e)
             }
     
+    def _fetch_page(self, url: str) -> bytes:
+        """
+        Download at most MAX_PAGE_BYTES of an HTML page.
+        
+        Raises:
+            urllib3.exceptions.HTTPError: On network errors and HTTP error statuses
+            ValueError: If the response is not HTML
+        """
+        response = self.http.request('GET', url, timeout=self.timeout, preload_content=False)
+        complete = False
+        try:
+            if response.status >= 400:
+                kind = "Client" if response.status < 500 else "Server"
+                raise urllib3.exceptions.HTTPError(
+                    f"{response.status} {kind} Error: {response.reason} for url: {url}"
+                )
+            
+            content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+            if content_type and content_type not in _HTML_CONTENT_TYPES:
+                raise ValueError(f"Unsupported content type: {content_type}")
+            
+            chunks = []
+            size = 0
+            complete = True
+            for chunk in response.stream(65536):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= MAX_PAGE_BYTES:
+                    complete = False
+                    break
+        finally:
+            # A fully read response goes back to the pool; an unread or
+            # truncated one has its connection closed instead
+            if not complete:
+                response.close()
+            response.release_conn()
+        
+        return b''.join(chunks)[:MAX_PAGE_BYTES]
+    
+    def _scrape_cached(self, url: str, selector: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Scrape a page with the selector (or auto-detect without one),
+        reusing a successful result for scrape_cache_ttl seconds.
+        """
+        key = (url, selector)
+        now = time.monotonic()
+        with self._scrape_cache_lock:
+            entry = self._scrape_cache.get(key)
+            if entry is not None and now < entry[0]:
+                self._scrape_cache.move_to_end(key)
+                return entry[1]
+        
+        if selector:
+            result = self._scrape_price(url, selector)
+        else:
+            result = self._auto_detect_price(url)
+        
+        # Failures are not cached, so the next call retries the page
+        if result["success"] and self.scrape_cache_ttl > 0:
+            with self._scrape_cache_lock:
+                self._scrape_cache[key] = (now + self.scrape_cache_ttl, result)
+                self._scrape_cache.move_to_end(key)
+                while len(self._scrape_cache) > SCRAPE_CACHE_SIZE:
+                    self._scrape_cache.popitem(last=False)
+        return result
+    
+    def clear_cache(self) -> Dict[str, Any]:
+        """
+        Drop cached scrape results, so the next collection refetches every page.
+        
+        Returns:
+            Dictionary with the number of entries cleared
+        """
+        with self._scrape_cache_lock:
+            cleared = len(self._scrape_cache)
+            self._scrape_cache.clear()
+        return {
+            "success": True,
+            "cleared": cleared
+        }
+    
     def _scrape_price(self, url: str, selector: str) -> Dict[str, Any]:
         """Scrape price from a webpage using CSS selector."""
         try:
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(self._fetch_page(url), _HTML_PARSER)
             
             # Find price element
             element = soup.select_one(selector)
@@ -351,39 +678,37 @@ class PriceDataCollectorTool:
     def _auto_detect_price(self, url: str) -> Dict[str, Any]:
         """Auto-detect price on a webpage."""
         try:
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Common price selectors
-            price_selectors = [
-                '[class*="price"]',
-                '[id*="price"]',
-                '[itemprop="price"]',
-                '.product-price',
-                '#price',
-                'span.price',
-                'div.price'
-            ]
-            
-            for selector in price_selectors:
-                elements = soup.select(selector)
-                for element in elements:
-                    price_text = element.get_text(strip=True)
-                    price = self._extract_price_from_text(price_text)
-                    if price is not None:
-                        return {
-                            "success": True,
-                            "price": price,
-                            "currency": "USD",
-                            "raw_text": price_text,
-                            "selector_used": selector
-                        }
+            soup = BeautifulSoup(self._fetch_page(url), _HTML_PARSER)
+            
+            # One pass over the page; among the matches, the element of the
+            # most preferred selector wins, then the first in document order
+            best = None
+            for element in _PRICE_SELECTOR_ALL.select(soup):
+                rank = next(i for i, pattern in enumerate(_PRICE_PATTERNS) if pattern.match(element))
+                if best is not None and rank >= best[0]:
+                    continue
+                price_text = element.get_text(strip=True)
+                if len(price_text) > MAX_PRICE_TEXT_LENGTH:
+                    continue
+                price = self._extract_price_from_text(price_text)
+                if price is not None:
+                    best = (rank, price, price_text)
+                    if rank == 0:
+                        break
+            
+            if best is None:
+                return {
+                    "success": False,
+                    "error": "Could not auto-detect price on page"
+                }
             
+            rank, price, price_text = best
             return {
-                "success": False,
-                "error": "Could not auto-detect price on page"
+                "success": True,
+                "price": price,
+                "currency": "USD",
+                "raw_text": price_text,
+                "selector_used": _PRICE_SELECTORS[rank]
             }
             
         except Exception as e:
@@ -401,27 +726,48 @@ class PriceDataCollectorTool:
         }
     
     def _extract_price_from_text(self, text: str) -> Optional[float]:
-        """Extract numeric price from text."""
-        # Remove currency symbols but keep digits, commas, and periods
-        cleaned = re.sub(r'[^\d.,]', '', text)
+        """Extract numeric price from text (the first number in it)."""
+        match = _PRICE_RE.search(text)
+        if match is None:
+            return None
         
         # Remove commas (thousands separators)
-        cleaned = cleaned.replace(',', '')
-        
-        # Handle multiple decimal points by keeping only the last one
-        parts = cleaned.split('.')
-        if len(parts) > 2:
-            cleaned = ''.join(parts[:-1]) + '.' + parts[-1]
+        return float(match.group().replace(',', ''))
+    
+    def close(self):
+        """
+        Checkpoint the write-ahead log into the database file, then close
+        every database connection and the HTTP connection pools. The collector
+        reopens connections if it is used again (an in-memory database then
+        starts out empty).
+        """
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        self._local = threading.local()
         
         try:
-            return float(cleaned)
-        except:
-            return None
+            if connections:
+                # TRUNCATE also empties the -wal file, so the next open has
+                # nothing to replay
+                connections[0].execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            for conn in connections:
+                conn.close()
+            self.http.clear()
+    
+    def __enter__(self) -> "PriceDataCollectorTool":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
     
     def __del__(self):
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
+        """Best-effort close for collectors that were not closed explicitly."""
+        try:
+            self.close()
+        except Exception:
+            pass
 
 # OpenAI function definitions
 OPENAI_FUNCTIONS = [
@@ -452,7 +798,8 @@ OPENAI_FUNCTIONS = [
                 "type": "object",
                 "properties": {
                     "item_id": {"type": "string", "description": "Unique identifier for the item"},
-                    "days": {"type": "integer", "description": "Number of days of history", "default": 30}
+                    "days": {"type": "integer", "description": "Number of days of history", "default": 30},
+                    "include_history": {"type": "boolean", "description": "Include individual price entries (statistics only when false)", "default": True}
                 },
                 "required": ["item_id"]
             }
@@ -487,9 +834,10 @@ TOOL_INFO = {
         "collect_price",
         "collect_multiple",
         "get_price_history",
-        "get_price_alerts"
+        "get_price_alerts",
+        "clear_cache"
     ],
-    "requirements": ["requests", "beautifulsoup4", "sqlite3"],
+    "requirements": ["urllib3", "beautifulsoup4", "lxml", "sqlite3"],
     "safety_features": [
         "Database persistence",
         "Price validation",